@@ -1,21 +1,48 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 import speech_recognition as sr
-from gtts import gTTS
 import os
-import tempfile
 import threading
-import cv2
-import numpy as np
-from graph import graph
+from graph import astream_response, asummarize_history, get_llm
+from detectors import detector_pool
+from expression import analyze_frame, expression_context
+from executors import stages
+from sessions import conversations, DEFAULT_SESSION
+from expression_state import expression_states
+from tts import get_tts_engine, split_sentences, SentenceChunker, TTSPipeline
+from audio_cache import audio_cache
+from response_cache import response_cache
+from audio_ingest import ingest_audio
+from asr import get_asr_engine, transcribe_utterances
+from vad import vad
+from metrics import metrics, MetricsMiddleware
 from dotenv import load_dotenv
-from pydub import AudioSegment
-import io
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import List
 
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the cascades for the event loop thread before the first frame arrives
+    detector_pool.warm_up()
+    stages.start()
+    # Load the speech model before the first upload rather than during it
+    await stages.run_io(asr_engine.warm_up)
+    # One LLM client (and connection pool) for the whole process
+    try:
+        await stages.run_io(get_llm)
+    except ValueError as e:
+        print(f"⚠️ LLM not configured, requests will fail until it is: {e}")
+    yield
+    stages.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware to allow frontend to connect
 app.add_middleware(
@@ -24,312 +51,504 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
-# Global conversation state
-messages = []
 current_expression = {"expression": "Neutral", "detected": False}
 expression_lock = threading.Lock()
 
+tts_engine = get_tts_engine()
+asr_engine = get_asr_engine()
+
 
-def detect_expression_from_face(face_gray, face_color):
+@app.get("/")
+async def root():
+    return {"status": "ok", "message": "Hindi AI Assistant API"}
+
+
+async def generate_response(conversation, summary=""):
     """
-    Enhanced expression detection based on multiple facial features.
-    Returns expression text with emoji and color tuple (B, G, R) for visualization.
+    Run the conversation through the graph and return the final AI message text.
     """
-    eye_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_eye.xml'
-    )
-    smile_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_smile.xml'
-    )
-    
-    eyes = eye_cascade.detectMultiScale(face_gray, scaleFactor=1.1, minNeighbors=15, minSize=(15, 15))
-    
-    smile_high = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.5, minNeighbors=12, minSize=(20, 20))
-    smile_medium = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.3, minNeighbors=8, minSize=(15, 15))
-    smile_low = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=5, minSize=(10, 10))
-    
-    brightness = np.mean(face_gray)
-    
-    height, width = face_gray.shape
-    
-    upper_face = face_gray[0:int(height*0.5), :]
-    lower_face = face_gray[int(height*0.5):, :]
-    
-    middle_face = face_gray[int(height*0.3):int(height*0.7), :]
-    lower_third = face_gray[int(height*0.66):, :]
-    
-    eyes_loose = eye_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=8, minSize=(10, 10))
-    
-    num_eyes = len(eyes)
-    num_smiles_high = len(smile_high)
-    num_smiles_medium = len(smile_medium)
-    num_smiles_low = len(smile_low)
-    has_weak_smile = len(smile_low) > 0
-    
-    upper_brightness = np.mean(upper_face)
-    lower_brightness = np.mean(lower_face)
-    middle_brightness = np.mean(middle_face)
-    lower_contrast = np.std(lower_third)
-    
-    if num_smiles_high > 0:
-        return "Happy 😄", (0, 255, 0)
-    
-    if num_smiles_medium > 0:
-        return "Happy 😄", (0, 255, 0)
-    
-    if num_smiles_low > 0 and num_eyes >= 1:
-        return "Content 😊", (50, 255, 100)
-    
-    if num_eyes < 2 and len(eyes_loose) >= 1:
-        return "Sleepy 😴", (150, 150, 255)
-    
-    if num_eyes == 0:
-        return "Surprised 😮", (255, 200, 0)
-    
-    if num_eyes >= 2:
-        if upper_brightness < lower_brightness - 15:
-            return "Thinking 🤔", (255, 150, 50)
-        
-        if brightness < 75 or (upper_brightness < middle_brightness - 12):
-            return "Serious 😐", (255, 100, 100)
-        
-        if lower_contrast < 35 and 80 <= brightness <= 100:
-            return "Sad 😢", (100, 100, 255)
-        
-        if brightness < 85 and not has_weak_smile:
-            return "Sad 😢", (100, 100, 255)
-        
-        return "Neutral 😊", (200, 200, 200)
-    
-    return "Neutral 😊", (200, 200, 200)
+    final = None
+    async for kind, value in generate_stream(conversation, summary):
+        if kind == "final":
+            final = value
+    return final
 
 
-def get_expression_context(expression: str):
+async def generate_stream(conversation, summary=""):
     """
-    Get current facial expression as context for LLM.
-    Returns a Hindi context string.
+    astream_response timed as the "llm" stage. Runs on the event loop: the
+    provider calls are awaited, not parked on I/O pool threads.
     """
-    if not expression:
-        return ""
-    
-    expression_clean = expression.split()[0] if expression else ""
+    with metrics.stage("llm"):
+        async for item in astream_response(conversation, summary):
+            yield item
+
+
+def synthesize_to_file(text):
+    """
+    Synthesize text through the audio cache and return the cached file name.
+    """
+    with metrics.stage("tts"):
+        return audio_cache.synthesize(text, tts_engine)
+
+
+async def synthesize_response(text):
+    """
+    Synthesize every sentence concurrently and join them into one MP3 file.
+    Sentences and the joined response are both cached, so repeated phrases
+    never reach the TTS engine twice.
+    """
+    key = audio_cache.key(text, tts_engine)
+    if audio_cache.contains(key):
+        return audio_cache.filename(key)
     
-    expression_map = {
-        "Happy": "उपयोगकर्ता खुश दिख रहे हैं",
-        "Content": "उपयोगकर्ता संतुष्ट दिख रहे हैं",
-        "Sad": "उपयोगकर्ता उदास दिख रहे हैं",
-        "Surprised": "उपयोगकर्ता हैरान दिख रहे हैं",
-        "Thinking": "उपयोगकर्ता सोच रहे हैं",
-        "Sleepy": "उपयोगकर्ता थके हुए दिख रहे हैं",
-        "Serious": "उपयोगकर्ता गंभीर दिख रहे हैं",
-        "Neutral": "उपयोगकर्ता शांत दिख रहे हैं"
-    }
+    sentences = split_sentences(text)
+    pipeline = TTSPipeline(synthesize_to_file, stages)
+    for sentence in sentences:
+        pipeline.submit(sentence)
+    try:
+        filenames = [audio_filename async for _, audio_filename in pipeline.remaining()]
+    finally:
+        pipeline.cancel()
     
-    context = expression_map.get(expression_clean, "")
-    return f"\n[संदर्भ: {context}]" if context else ""
+    if len(filenames) == 1:
+        return filenames[0]
+    return await stages.run_io(audio_cache.join, key, sentences, tts_engine)
 
 
-@app.get("/")
-async def root():
-    return {"status": "ok", "message": "Hindi AI Assistant API"}
+UNRECOGNIZED_RESPONSE = "क्षमा करें, मैं आपकी बात समझ नहीं पाया। कृपया फिर से प्रयास करें।"
+EMPTY_RESPONSE = "क्षमा करें, मुझे कोई प्रतिक्रिया नहीं मिली।"
+
+
+async def unrecognized_audio():
+    """
+    The spoken UNRECOGNIZED_RESPONSE, or None when TTS fails, so speech that
+    was not understood is still answered (as text only) instead of erroring.
+    """
+    try:
+        return await synthesize_response(UNRECOGNIZED_RESPONSE)
+    except Exception as e:
+        print(f"⚠️ Could not synthesize the not-understood reply: {e}")
+        return None
+
+
+async def transcribe_upload(content):
+    """
+    Decode and transcribe an uploaded recording on the I/O pool, in memory.
+    Silence is trimmed before recognition and a recording without speech
+    is rejected without calling the ASR engine at all.
+    Raises sr.UnknownValueError or sr.RequestError from the ASR engine.
+    """
+    with metrics.stage("ingest"):
+        audio_data = await stages.run_io(ingest_audio, content)
+    with metrics.stage("vad"):
+        utterances = await stages.run_io(vad.split, audio_data)
+    if not utterances:
+        raise sr.UnknownValueError()
+    with metrics.stage("asr"):
+        return await stages.run_io(transcribe_utterances, asr_engine, utterances)
+
+
+def cached_audio(cached):
+    """
+    The audio files of a cached response, or None once any was evicted
+    from the audio cache.
+    """
+    filenames = cached.audio_filenames
+    if filenames and all(audio_cache.path(filename) for filename in filenames):
+        return filenames
+    return None
+
+
+# Background summarizations by session id; tasks are kept referenced until done
+summary_tasks = {}
+
+
+def summarize_later(session_id):
+    """
+    Fold the session's older turns into its running summary in the
+    background, once the reply has been sent. At most one summarization per
+    session runs at a time; a turn finishing meanwhile leaves the rest to
+    the next one.
+    """
+    if session_id in summary_tasks:
+        return
+    task = asyncio.create_task(summarize_session(session_id))
+    summary_tasks[session_id] = task
+    task.add_done_callback(lambda _: summary_tasks.pop(session_id, None))
+
+
+async def summarize_session(session_id):
+    history = conversations.history(session_id)
+    try:
+        result = await asummarize_history(history, conversations.summary(session_id))
+    except Exception as e:
+        print(f"⚠️ Summarization failed, keeping the full history: {e}")
+        return
+    if result is not None:
+        summary, folded = result
+        conversations.fold(session_id, history[:folded], summary)
+
+
+def session_expression(session_id, expression, expression_confidence):
+    """
+    The expression to give the LLM: the session's smoothed camera state when
+    frames for it are being analyzed, otherwise what the client sent.
+    """
+    label, confidence = expression_states.current(session_id)
+    if label is None:
+        return expression, float(expression_confidence)
+    return label, confidence
+
+
+async def analyze_session_frame(session_id, image_data):
+    """
+    Analyze a frame and fold it into the session's smoothed expression.
+    Frames arriving while the expression is stable may be answered from the
+    smoothed state without running detection.
+    """
+    cached = expression_states.cached(session_id)
+    if cached is not None:
+        return cached
+    with metrics.stage("cv"):
+        result = await stages.run_cv(analyze_frame, image_data)
+    return expression_states.observe(session_id, result)
 
 
 @app.post("/process-audio")
 async def process_audio(
     audio: UploadFile = File(...),
     expression: str = Form(""),
-    expression_confidence: str = Form("0")
+    expression_confidence: str = Form("0"),
+    session_id: str = Form(DEFAULT_SESSION)
 ):
     """
     Process audio file with speech recognition and generate AI response.
+    Every blocking stage runs on the I/O pool so other clients keep being served.
     """
     try:
-        content = await audio.read()
+        with metrics.stage("upload"):
+            content = await audio.read()
         
         try:
-            audio_segment = AudioSegment.from_file(io.BytesIO(content))
-            
-            wav_io = io.BytesIO()
-            audio_segment.export(
-                wav_io,
-                format="wav",
-                parameters=["-ar", "16000", "-ac", "1"]
-            )
-            wav_io.seek(0)
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-                temp_audio.write(wav_io.read())
-                temp_audio_path = temp_audio.name
-                
-        except Exception as e:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-                temp_audio.write(content)
-                temp_audio_path = temp_audio.name
-
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(temp_audio_path) as source:
-            audio_data = recognizer.record(source)
-            
-        try:
-            transcript = recognizer.recognize_google(audio_data, language="hi-IN")
+            transcript = await transcribe_upload(content)
         except sr.UnknownValueError:
-            os.unlink(temp_audio_path)
-            return {
+            result = {
                 "transcript": "",
-                "response": "क्षमा करें, मैं आपकी बात समझ नहीं पाया। कृपया फिर से प्रयास करें।",
+                "response": UNRECOGNIZED_RESPONSE,
                 "error": "UnknownValueError"
             }
+            audio_filename = await unrecognized_audio()
+            if audio_filename:
+                result["audio_url"] = f"/audio/{audio_filename}"
+            return result
         except sr.RequestError as e:
-            os.unlink(temp_audio_path)
             raise HTTPException(status_code=500, detail=f"Speech recognition error: {e}")
         
-        os.unlink(temp_audio_path)
-        
-        expression_context = get_expression_context(expression)
-        user_message = transcript + expression_context
-        
-        messages.append({"role": "user", "content": user_message})
+        expression, confidence = session_expression(session_id, expression, expression_confidence)
+        context = expression_context(expression)
+        cache_key = response_cache.key(transcript, context, conversations.history(session_id))
         
-        response_text = None
-        for event in graph.stream({"messages": messages}, stream_mode="values"):
-            if "messages" in event:
-                last_message = event["messages"][-1]
-                if hasattr(last_message, 'type') and last_message.type == "ai":
-                    response_text = last_message.content
+        conversations.append(session_id, "user", transcript + context)
         
-        if not response_text:
-            response_text = "क्षमा करें, मुझे कोई प्रतिक्रिया नहीं मिली।"
-        
-        messages.append({"role": "assistant", "content": response_text})
-        
-        tts = gTTS(text=response_text, lang='hi', slow=False)
-        audio_filename = f"response_{len(messages)}.mp3"
-        audio_path = os.path.join(tempfile.gettempdir(), audio_filename)
-        tts.save(audio_path)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            # Repeated utterance: no LLM call, and the audio is already on disk
+            response_text = cached.text
+            conversations.append(session_id, "assistant", response_text)
+            filenames = cached_audio(cached)
+            if filenames and len(filenames) == 1:
+                audio_filename = filenames[0]
+            else:
+                audio_filename = await synthesize_response(response_text)
+        else:
+            response_text = await generate_response(
+                conversations.history(session_id),
+                conversations.summary(session_id)
+            )
+            
+            if not response_text:
+                response_text = EMPTY_RESPONSE
+            
+            conversations.append(session_id, "assistant", response_text)
+            
+            audio_filename = await synthesize_response(response_text)
+            if response_text != EMPTY_RESPONSE:
+                response_cache.put(cache_key, response_text, [audio_filename])
         
+        summarize_later(session_id)
         return {
             "transcript": transcript,
             "response": response_text,
             "audio_url": f"/audio/{audio_filename}",
             "expression": expression,
-            "expression_confidence": float(expression_confidence)
+            "expression_confidence": confidence
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/process-audio/stream")
+async def process_audio_stream(
+    audio: UploadFile = File(...),
+    expression: str = Form(""),
+    expression_confidence: str = Form("0"),
+    session_id: str = Form(DEFAULT_SESSION)
+):
+    """
+    Streaming variant of /process-audio using Server-Sent Events.
+    Emits "transcript" once speech is recognized, "token" for every piece of
+    the response as the LLM generates it, "audio" with the URL of each
+    sentence's speech as soon as it is synthesized (in order, numbered by
+    "index"), "response" with the full text and finally "done" (or "error").
+    """
+    with metrics.stage("upload"):
+        content = await audio.read()
+    
+    async def events():
+        try:
+            try:
+                transcript = await transcribe_upload(content)
+            except sr.UnknownValueError:
+                yield sse_event("transcript", {"transcript": ""})
+                yield sse_event("response", {"response": UNRECOGNIZED_RESPONSE, "error": "UnknownValueError"})
+                audio_filename = await unrecognized_audio()
+                if audio_filename:
+                    yield sse_event("audio", {"audio_url": f"/audio/{audio_filename}", "index": 0})
+                yield sse_event("done", {"audio_count": 1 if audio_filename else 0})
+                return
+            
+            yield sse_event("transcript", {"transcript": transcript})
+            
+            expression_used, confidence = session_expression(session_id, expression, expression_confidence)
+            context = expression_context(expression_used)
+            cache_key = response_cache.key(transcript, context, conversations.history(session_id))
+            conversations.append(session_id, "user", transcript + context)
+            
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                conversations.append(session_id, "assistant", cached.text)
+                yield sse_event("token", {"text": cached.text})
+                yield sse_event("response", {
+                    "response": cached.text,
+                    "expression": expression_used,
+                    "expression_confidence": confidence
+                })
+                filenames = cached_audio(cached) or [await synthesize_response(cached.text)]
+                for index, audio_filename in enumerate(filenames):
+                    yield sse_event("audio", {"audio_url": f"/audio/{audio_filename}", "index": index})
+                summarize_later(session_id)
+                yield sse_event("done", {"audio_count": len(filenames)})
+                return
+            
+            # Sentences are synthesized while the LLM keeps generating
+            chunker = SentenceChunker()
+            pipeline = TTSPipeline(synthesize_to_file, stages)
+            audio_filenames = []
+            
+            response_text = None
+            async for kind, value in generate_stream(
+                conversations.history(session_id),
+                conversations.summary(session_id)
+            ):
+                if kind == "token":
+                    yield sse_event("token", {"text": value})
+                    for sentence in chunker.feed(value):
+                        pipeline.submit(sentence)
+                    for index, audio_filename in pipeline.ready():
+                        yield sse_event("audio", {"audio_url": f"/audio/{audio_filename}", "index": index})
+                        audio_filenames.append(audio_filename)
+                else:
+                    response_text = value
+            
+            rest = chunker.flush()
+            if rest:
+                pipeline.submit(rest)
+            if not response_text:
+                response_text = EMPTY_RESPONSE
+                pipeline.submit(response_text)
+            
+            conversations.append(session_id, "assistant", response_text)
+            yield sse_event("response", {
+                "response": response_text,
+                "expression": expression_used,
+                "expression_confidence": confidence
+            })
+            
+            try:
+                async for index, audio_filename in pipeline.remaining():
+                    yield sse_event("audio", {"audio_url": f"/audio/{audio_filename}", "index": index})
+                    audio_filenames.append(audio_filename)
+            finally:
+                pipeline.cancel()
+            
+            if response_text != EMPTY_RESPONSE:
+                response_cache.put(cache_key, response_text, audio_filenames)
+            summarize_later(session_id)
+            yield sse_event("done", {"audio_count": len(audio_filenames)})
+        
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/audio/{filename}")
-async def get_audio(filename: str):
+async def get_audio(filename: str, request: Request):
     """
-    Serve generated audio files.
+    Serve synthesized audio from the cache.
+    File names are content hashes, so responses are immutable and cacheable.
     """
-    audio_path = os.path.join(tempfile.gettempdir(), filename)
-    if not os.path.exists(audio_path):
+    audio_path = audio_cache.path(filename)
+    if audio_path is None or not os.path.exists(audio_path):
         raise HTTPException(status_code=404, detail="Audio file not found")
     
+    headers = {
+        "ETag": f'"{filename[:-len(".mp3")]}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Content-Disposition": f"inline; filename={filename}"
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
     return FileResponse(
         audio_path,
         media_type="audio/mpeg",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
+        headers=headers
     )
 
 
 @app.post("/reset")
-async def reset_conversation():
+async def reset_conversation(session_id: str = Form(DEFAULT_SESSION)):
     """
-    Reset the conversation history.
+    Reset the conversation history of one session.
     """
-    global messages
-    messages = []
+    conversations.reset(session_id)
     return {"status": "ok", "message": "Conversation reset"}
 
 
 @app.post("/detect-face")
-async def detect_face(image: UploadFile = File(...)):
+async def detect_face(image: UploadFile = File(...), session_id: str = Form(DEFAULT_SESSION)):
     """
     Detect face and expression from uploaded image frame.
+    "expression" and "confidence" are smoothed over the session's recent
+    frames; "frame_expression" is this frame's own label.
     """
-    try:
+    with metrics.stage("upload"):
         image_data = await image.read()
-        
-        nparr = np.frombuffer(image_data, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if frame is None:
-            return {
-                "face_detected": False,
-                "expression": "Neutral 😊",
-                "confidence": 0.0,
-                "color": [200, 200, 200],
-                "face_count": 0
-            }
-        
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
-        
-        faces = face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=1.1, 
-            minNeighbors=5, 
-            minSize=(50, 50),
-            flags=cv2.CASCADE_SCALE_IMAGE
-        )
-        
-        if len(faces) == 0:
-            return {
-                "face_detected": False,
-                "expression": "Neutral 😊",
-                "confidence": 0.0,
-                "color": [200, 200, 200],
-                "face_count": 0
-            }
-        
-        x, y, w, h = faces[0]
-        face_gray = gray[y:y+h, x:x+w]
-        face_color = frame[y:y+h, x:x+w]
-        
-        expression_with_emoji, color_bgr = detect_expression_from_face(face_gray, face_color)
-        
-        frame_area = gray.shape[0] * gray.shape[1]
-        face_area = w * h
-        confidence = min(face_area / frame_area * 5, 1.0)
-        
-        color_rgb = [color_bgr[2], color_bgr[1], color_bgr[0]]
-        
-        return {
-            "face_detected": True,
-            "expression": expression_with_emoji,
-            "confidence": round(confidence, 2),
-            "color": color_rgb,
-            "face_count": len(faces),
-            "face_dimensions": {
-                "x": int(x),
-                "y": int(y),
-                "width": int(w),
-                "height": int(h)
-            }
-        }
-        
-    except Exception as e:
-        return {
-            "face_detected": False,
-            "expression": "Neutral 😊",
-            "confidence": 0.0,
-            "color": [200, 200, 200],
-            "face_count": 0,
-            "error": str(e)
-        }
+    return await analyze_session_frame(session_id, image_data)
+
+
+@app.post("/detect-face/batch")
+async def detect_face_batch(
+    images: List[UploadFile] = File(...),
+    session_ids: List[str] = Form([])
+):
+    """
+    Detect faces and expressions for several frames in one request.
+    Frames are decoded and analyzed in parallel on the CV worker pool.
+    session_ids, when given, must line up with images and is echoed back
+    so frames from different sessions can share a request.
+    """
+    if session_ids and len(session_ids) != len(images):
+        raise HTTPException(status_code=400, detail="session_ids must match the number of images")
+    
+    with metrics.stage("upload"):
+        frames = [await image.read() for image in images]
+    
+    with metrics.stage("cv"):
+        results = await asyncio.gather(*[
+            stages.run_cv(analyze_frame, image_data)
+            for image_data in frames
+        ])
+    
+    if session_ids:
+        # Smooth in upload order once every frame is analyzed
+        results = [
+            dict(expression_states.observe(session_id, result), session_id=session_id)
+            for result, session_id in zip(results, session_ids)
+        ]
+    
+    return {"results": results, "frame_count": len(results)}
+
+
+@app.websocket("/ws/expression")
+async def expression_stream(websocket: WebSocket):
+    """
+    Stream camera frames as binary messages and receive /detect-face results.
+    Only the newest pending frame is kept: frames that arrive while one is
+    being analyzed replace each other, so results never lag behind the camera.
+    """
+    await websocket.accept()
+    session_id = websocket.query_params.get("session_id", DEFAULT_SESSION)
+    
+    pending = {"frame": None, "closed": False}
+    frame_ready = asyncio.Event()
+    
+    async def receive_frames():
+        try:
+            while True:
+                pending["frame"] = await websocket.receive_bytes()
+                frame_ready.set()
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            pending["closed"] = True
+            frame_ready.set()
+    
+    receiver = asyncio.create_task(receive_frames())
+    
+    try:
+        while True:
+            await frame_ready.wait()
+            frame_ready.clear()
+            if pending["closed"]:
+                break
+            
+            image_data, pending["frame"] = pending["frame"], None
+            if image_data is None:
+                continue
+            
+            result = await analyze_session_frame(session_id, image_data)
+            await websocket.send_json(result)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "messages_count": len(messages)}
+    return {
+        "status": "healthy",
+        "sessions": conversations.stats(),
+        "expression_states": expression_states.stats(),
+        "audio_cache": audio_cache.stats(),
+        "response_cache": response_cache.stats()
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Stage and request metrics in the Prometheus text format.
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/expressions")
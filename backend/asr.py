@@ -0,0 +1,227 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import speech_recognition as sr
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+
+def to_pcm(audio_data):
+    """
+    16 kHz mono 16-bit PCM bytes for any sr.AudioData (microphone captures
+    arrive at the device rate).
+    """
+    return audio_data.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=SAMPLE_WIDTH)
+
+
+def audio_seconds(audio_data):
+    return len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+
+
+class GoogleASR:
+    """
+    Google Web Speech API through speech_recognition; one network round trip per utterance.
+    """
+
+    name = "google"
+
+    def __init__(self, language="hi-IN"):
+        self.language = language
+
+    def warm_up(self):
+        pass
+
+    def transcribe(self, audio_data):
+        """
+        Recognize speech in AudioData. Raises sr.UnknownValueError or sr.RequestError.
+        """
+        return sr.Recognizer().recognize_google(audio_data, language=self.language)
+
+    def transcribe_batch(self, audios):
+        results = []
+        for audio_data in audios:
+            try:
+                results.append(self.transcribe(audio_data))
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                results.append(e)
+        return results
+
+
+class VoskASR:
+    """
+    Offline Kaldi recognizer (Vosk) running on the CPU.
+    The model is loaded once and shared; a pool of recognizers is built
+    against it up front so no request pays for model or graph setup.
+    A recognizer resets itself after FinalResult and goes back to the pool.
+    """
+
+    name = "vosk"
+
+    def __init__(self, model_path=None, workers=None):
+        if vosk is None:
+            raise RuntimeError("ASR_ENGINE=vosk needs the 'vosk' package")
+        self.model_path = model_path or os.getenv("VOSK_MODEL_PATH")
+        # Vosk would otherwise download a model on first use, inside the lifespan
+        if not self.model_path or not os.path.isdir(self.model_path):
+            raise RuntimeError(
+                "ASR_ENGINE=vosk needs VOSK_MODEL_PATH set to an unpacked Hindi model directory "
+                f"(e.g. vosk-model-hi-0.22 from https://alphacephei.com/vosk/models), got {self.model_path!r}"
+            )
+        self.workers = workers or int(os.getenv("ASR_WORKERS", os.cpu_count() or 4))
+
+        self._model = None
+        self._recognizers = queue.Queue()
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        with self._lock:
+            if self._model is not None:
+                return
+            vosk.SetLogLevel(-1)
+            self._model = vosk.Model(self.model_path)
+            for _ in range(self.workers):
+                self._recognizers.put(vosk.KaldiRecognizer(self._model, SAMPLE_RATE))
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asr")
+
+    def transcribe(self, audio_data):
+        self.warm_up()
+        recognizer = self._recognizers.get()
+        try:
+            recognizer.AcceptWaveform(to_pcm(audio_data))
+            text = json.loads(recognizer.FinalResult()).get("text", "")
+        except Exception as e:
+            raise sr.RequestError(f"Vosk recognition failed: {e}")
+        finally:
+            self._recognizers.put(recognizer)
+
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def transcribe_batch(self, audios):
+        """
+        Decode a batch across the recognizer pool; Kaldi releases the GIL
+        while decoding, so utterances run in parallel. Failed utterances
+        come back as their exception.
+        """
+        self.warm_up()
+        futures = [self._pool.submit(self.transcribe, audio_data) for audio_data in audios]
+        return [future.exception() or future.result() for future in futures]
+
+
+class BatchingASR:
+    """
+    Micro-batcher in front of an engine: concurrent transcribe() calls are
+    collected for up to max_wait seconds (or max_batch utterances) and handed
+    to engine.transcribe_batch together, so a burst of uploads shares one
+    dispatch. Batches run on their own threads (at most max_concurrent at
+    once) while the dispatcher goes straight back to collecting, so a
+    request arriving mid-batch starts in the next batch instead of waiting
+    for the current one to finish.
+    """
+
+    def __init__(self, engine, max_batch=None, max_wait=None, max_concurrent=None):
+        self.engine = engine
+        self.name = engine.name
+        self.max_batch = max_batch or int(os.getenv("ASR_BATCH_SIZE", 8))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("ASR_BATCH_WAIT_MS", 10)) / 1000
+        self.max_concurrent = max_concurrent or int(os.getenv("ASR_BATCH_CONCURRENCY", 8))
+
+        self._pending = queue.Queue()
+        self._dispatcher = None
+        self._batches = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        self.engine.warm_up()
+        with self._lock:
+            if self._dispatcher is None:
+                self._batches = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="asr-batch")
+                self._dispatcher = threading.Thread(target=self._dispatch, name="asr-batcher", daemon=True)
+                self._dispatcher.start()
+
+    def transcribe(self, audio_data):
+        self.warm_up()
+        future = Future()
+        self._pending.put((audio_data, future))
+        return future.result()
+
+    def transcribe_batch(self, audios):
+        return self.engine.transcribe_batch(audios)
+
+    def _dispatch(self):
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._pending.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                pass
+
+            callers = [future for _, future in batch]
+            running = self._batches.submit(self.engine.transcribe_batch, [audio_data for audio_data, _ in batch])
+            running.add_done_callback(lambda running, callers=callers: self._resolve(running, callers))
+
+    def _resolve(self, running, callers):
+        """
+        Hand each caller its result (or exception) once its batch is done.
+        """
+        error = running.exception()
+        results = [error] * len(callers) if error else running.result()
+        for future, result in zip(callers, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def transcribe_utterances(engine, utterances):
+    """
+    Transcribe the utterances of one capture and join the text.
+    Unrecognized utterances are skipped; raises sr.UnknownValueError when
+    none is recognized, or the first other error the engine reported.
+    """
+    if len(utterances) == 1:
+        return engine.transcribe(utterances[0])
+    results = engine.transcribe_batch(utterances)
+    texts = [result for result in results if isinstance(result, str)]
+    if texts:
+        return " ".join(texts)
+    errors = [result for result in results if not isinstance(result, sr.UnknownValueError)]
+    raise errors[0] if errors else sr.UnknownValueError()
+
+
+def get_asr_engine(name=None):
+    """
+    Build the engine selected by ASR_ENGINE ("google", "vosk" or "stub").
+    Offline engines are wrapped in a micro-batcher unless ASR_BATCH_SIZE is 1.
+    """
+    name = name or os.getenv("ASR_ENGINE", "google")
+    if name == "google":
+        return GoogleASR()
+    if name == "vosk":
+        engine = VoskASR()
+    elif name == "stub":
+        from fakes import StubASREngine
+        engine = StubASREngine(
+            latency=os.getenv("STUB_ASR_LATENCY", "0"),
+            rtf=float(os.getenv("STUB_ASR_RTF", 0)),
+            streams=int(os.getenv("STUB_ASR_STREAMS", 1))
+        )
+    else:
+        raise ValueError(f"Unknown ASR_ENGINE '{name}'")
+
+    if int(os.getenv("ASR_BATCH_SIZE", 8)) > 1:
+        return BatchingASR(engine)
+    return engine
@@ -0,0 +1,111 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import speech_recognition as sr
+from asr import GoogleASR, VoskASR, BatchingASR, audio_seconds
+from audio_ingest import ingest_audio
+from audio_ingest_benchmark import synthetic_utterance, make_wav
+from fakes import StubASREngine
+
+
+def load_utterances(paths, seconds):
+    """
+    Recorded utterances if given, otherwise synthetic ones of each length.
+    """
+    if paths:
+        utterances = []
+        for path in paths:
+            with open(path, "rb") as f:
+                utterances.append(ingest_audio(f.read()))
+        return utterances
+    return [ingest_audio(make_wav(synthetic_utterance(s, 16000), 16000, 1)) for s in seconds]
+
+
+def build_engine(name, args):
+    if name == "stub":
+        return StubASREngine(latency=args.stub_latency, rtf=args.stub_rtf)
+    if name == "vosk":
+        return VoskASR(model_path=args.vosk_model)
+    if name == "google":
+        return GoogleASR()
+    raise ValueError(f"Unknown engine '{name}'")
+
+
+def transcribe(engine, audio_data):
+    try:
+        engine.transcribe(audio_data)
+    except sr.UnknownValueError:
+        # Synthetic audio is not speech; the decode time still counts
+        pass
+
+
+def sequential_rtf(engine, utterances, iterations):
+    """
+    Real-time factor per utterance: processing seconds / audio seconds.
+    """
+    factors = []
+    for _ in range(iterations):
+        for audio_data in utterances:
+            start = time.perf_counter()
+            transcribe(engine, audio_data)
+            factors.append((time.perf_counter() - start) / audio_seconds(audio_data))
+    return np.array(factors)
+
+
+def concurrent_throughput(engine, utterances, concurrency, requests):
+    """
+    Audio seconds transcribed per wall-clock second with concurrency callers.
+    """
+    jobs = [utterances[i % len(utterances)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda audio_data: transcribe(engine, audio_data), jobs))
+    elapsed = time.perf_counter() - start
+    return sum(audio_seconds(a) for a in jobs) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ASR real-time factor and throughput per backend")
+    parser.add_argument("--engines", nargs="+", default=["stub"], help="stub, vosk, google")
+    parser.add_argument("--wav", nargs="*", help="recorded utterances (any format audio_ingest decodes)")
+    parser.add_argument("--seconds", nargs="+", type=float, default=[2, 5, 10])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--batch-wait-ms", type=float, default=10)
+    parser.add_argument("--vosk-model", help="model directory (default: VOSK_MODEL_PATH)")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="fixed seconds per stub call")
+    parser.add_argument("--stub-rtf", type=float, default=0.1, help="stub seconds per audio second")
+    args = parser.parse_args()
+
+    utterances = load_utterances(args.wav, args.seconds)
+    total = sum(audio_seconds(a) for a in utterances)
+    print(f"{len(utterances)} utterances, {total:.1f}s of audio")
+
+    for name in args.engines:
+        try:
+            engine = build_engine(name, args)
+            start = time.perf_counter()
+            engine.warm_up()
+            warm_up = time.perf_counter() - start
+        except Exception as e:
+            print(f"{name:>7}: unavailable ({e})")
+            continue
+
+        try:
+            factors = sequential_rtf(engine, utterances, args.iterations)
+        except sr.RequestError as e:
+            print(f"{name:>7}: unavailable ({e})")
+            continue
+        print(f"{name:>7}: warm-up {warm_up:6.2f}s  RTF mean {factors.mean():.3f}  p95 {np.percentile(factors, 95):.3f}")
+
+        batched = BatchingASR(engine, max_batch=args.batch_size, max_wait=args.batch_wait_ms / 1000)
+        for label, target in (("unbatched", engine), (f"batched x{args.batch_size}", batched)):
+            throughput = concurrent_throughput(target, utterances, args.concurrency, args.requests)
+            print(f"{'':>7}  {label:>12}: {throughput:7.1f} audio s/s at concurrency {args.concurrency}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+FILENAME_PATTERN = re.compile(r"^[0-9a-f]{64}\.mp3$")
+
+
+class AudioCache:
+    """
+    Content-addressed store for synthesized speech.
+    Entries are named by a hash of (text, engine, voice settings), so a phrase
+    is synthesized once and then served from disk. The directory is capped at
+    max_bytes and the least recently used entries are evicted first.
+    Concurrent requests for the same missing entry wait for one producer.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.getenv(
+            "AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "hindi-assistant-audio")
+        )
+        self.max_bytes = max_bytes or int(os.getenv("AUDIO_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def key(text, engine):
+        settings = [text, engine.name, getattr(engine, "lang", None), getattr(engine, "slow", None)]
+        return hashlib.sha256(json.dumps(settings, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def filename(key):
+        return f"{key}.mp3"
+
+    def path(self, filename):
+        """
+        Absolute path of a cached file, or None if it is not a cache entry.
+        Marks the entry as recently used.
+        """
+        if not FILENAME_PATTERN.match(filename):
+            return None
+        key = filename[:-4]
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        return os.path.join(self.directory, filename)
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get_or_create(self, key, produce):
+        """
+        Return the cached file name for key, calling produce() -> bytes only
+        if no entry exists and no other thread is already producing it.
+        """
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self.filename(key)
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            self._store(key, produce())
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.set()
+        return self.filename(key)
+
+    def synthesize(self, text, engine):
+        """
+        Cached engine.synthesize(text); returns the cache file name.
+        """
+        return self.get_or_create(self.key(text, engine), lambda: engine.synthesize(text))
+
+    def read(self, key):
+        """
+        Bytes of a cached entry, or None if it is missing or was just evicted.
+        """
+        try:
+            with open(os.path.join(self.directory, self.filename(key)), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def join(self, key, texts, engine):
+        """
+        Store the speech of texts, concatenated, under key (MP3 frames
+        concatenate). Each part is read from the cache; a part evicted since
+        it was synthesized is synthesized again instead of failing the join.
+        """
+        def produce():
+            chunks = []
+            for text in texts:
+                chunk = self.read(self.key(text, engine))
+                chunks.append(chunk if chunk is not None else engine.synthesize(text))
+            return b"".join(chunks)
+
+        return self.get_or_create(key, produce)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "size_bytes": self._size_bytes}
+
+    def _store(self, key, audio_bytes):
+        path = os.path.join(self.directory, self.filename(key))
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(audio_bytes)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._entries[key] = len(audio_bytes)
+            self._size_bytes += len(audio_bytes)
+            self._evict()
+
+    def _evict(self):
+        # Never evict the entry that was just stored
+        while self._size_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._size_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, self.filename(key)))
+            except FileNotFoundError:
+                pass
+
+    def _load(self):
+        """
+        Index entries left by a previous run, oldest modification first.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if FILENAME_PATTERN.match(name):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size_bytes += size
+        self._evict()
+
+
+audio_cache = AudioCache()
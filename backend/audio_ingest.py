@@ -0,0 +1,123 @@
+import io
+import subprocess
+import wave
+import numpy as np
+import speech_recognition as sr
+
+try:
+    import av
+except ImportError:
+    av = None
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+WAV_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+def is_wav(content):
+    return content[:4] == b"RIFF" and content[8:12] == b"WAVE"
+
+
+def decode_to_pcm(content):
+    """
+    Decode an uploaded recording to 16 kHz mono 16-bit PCM bytes in memory.
+    WAV uploads are converted with numpy; anything else (the browser sends
+    WebM/Opus) is decoded in-process with PyAV, or by piping through an
+    ffmpeg subprocess when PyAV is not installed. Nothing touches the disk.
+    """
+    if is_wav(content):
+        pcm = _decode_wav(content)
+        if pcm is not None:
+            return pcm
+    if av is not None:
+        return _decode_av(content)
+    return _decode_ffmpeg(content)
+
+
+def ingest_audio(content):
+    """
+    Decode an upload straight into speech_recognition AudioData.
+    """
+    return sr.AudioData(decode_to_pcm(content), SAMPLE_RATE, SAMPLE_WIDTH)
+
+
+def resample(samples, rate):
+    """
+    Resample float mono samples to SAMPLE_RATE.
+    Integer ratios (48 kHz, 32 kHz) are decimated by block averaging,
+    anything else is linearly interpolated.
+    """
+    if rate == SAMPLE_RATE or len(samples) == 0:
+        return samples
+    if rate % SAMPLE_RATE == 0:
+        factor = rate // SAMPLE_RATE
+        usable = len(samples) - len(samples) % factor
+        return samples[:usable].reshape(-1, factor).mean(axis=1)
+    duration = len(samples) / rate
+    target = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    return np.interp(target, np.arange(len(samples)) / rate, samples)
+
+
+def _decode_wav(content):
+    """
+    PCM bytes of a plain integer WAV, or None for anything the wave module
+    cannot read (float or WAVE_FORMAT_EXTENSIBLE files), left to PyAV or ffmpeg.
+    """
+    try:
+        with wave.open(io.BytesIO(content)) as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except wave.Error:
+        return None
+
+    if channels == 1 and width == SAMPLE_WIDTH and rate == SAMPLE_RATE:
+        return frames
+    if width not in WAV_DTYPES:
+        return None
+
+    samples = np.frombuffer(frames, dtype=WAV_DTYPES[width])
+    if rate % SAMPLE_RATE == 0:
+        # Downmix and decimate in one pass: average each block of frames
+        block = channels * (rate // SAMPLE_RATE)
+        usable = len(samples) - len(samples) % block
+        samples = samples[:usable].reshape(-1, block).mean(axis=1, dtype=np.float32)
+    else:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+        samples = resample(samples, rate)
+
+    if width == 1:
+        samples = (samples - 128) * 256
+    elif width == 4:
+        samples /= 65536
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+
+def _decode_av(content):
+    chunks = []
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    with av.open(io.BytesIO(content)) as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().tobytes())
+    for resampled in resampler.resample(None):
+        chunks.append(resampled.to_ndarray().tobytes())
+    return b"".join(chunks)
+
+
+def _decode_ffmpeg(content):
+    result = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE), "-ac", "1",
+            "pipe:1"
+        ],
+        input=content,
+        capture_output=True,
+        check=True
+    )
+    return result.stdout
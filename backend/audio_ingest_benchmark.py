@@ -0,0 +1,111 @@
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+import wave
+import numpy as np
+import speech_recognition as sr
+from audio_ingest import av, ingest_audio
+
+
+def legacy_ingest(content):
+    """
+    The original path: pydub/ffmpeg export to WAV, copy to a temp file, re-read it.
+    """
+    try:
+        from pydub import AudioSegment
+        audio_segment = AudioSegment.from_file(io.BytesIO(content))
+        wav_io = io.BytesIO()
+        audio_segment.export(wav_io, format="wav", parameters=["-ar", "16000", "-ac", "1"])
+        wav_io.seek(0)
+        data = wav_io.read()
+    except Exception:
+        data = content
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
+        temp_audio.write(data)
+        temp_audio_path = temp_audio.name
+    try:
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(temp_audio_path) as source:
+            return recognizer.record(source)
+    finally:
+        os.unlink(temp_audio_path)
+
+
+def synthetic_utterance(seconds, rate):
+    """
+    A voiced-speech-like signal: harmonics with a syllable-rate envelope.
+    """
+    t = np.arange(int(seconds * rate)) / rate
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    signal = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 540, 720)))
+    return (signal * envelope * 6000).astype(np.int16)
+
+
+def make_wav(samples, rate, channels):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(samples, channels).tobytes())
+    return buffer.getvalue()
+
+
+def make_webm(samples, rate):
+    """
+    Encode like a browser MediaRecorder: Opus in WebM, 48 kHz mono.
+    """
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format="webm") as container:
+        stream = container.add_stream("libopus", rate=rate)
+        stream.layout = "mono"
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+def measure(ingest, content, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        ingest(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-utterance audio ingest time: temp-file path vs in-memory")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    inputs = {
+        "wav 16k mono": make_wav(synthetic_utterance(args.seconds, 16000), 16000, 1),
+        "wav 48k stereo": make_wav(synthetic_utterance(args.seconds, 48000), 48000, 2),
+    }
+    if av is not None:
+        inputs["webm/opus 48k"] = make_webm(synthetic_utterance(args.seconds, 48000), 48000)
+
+    print(f"{args.seconds:.0f}s utterances, {args.iterations} iterations")
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg not found: the legacy path cannot transcode and reads WAV uploads as-is")
+    for label, content in inputs.items():
+        for path, ingest in (("legacy", legacy_ingest), ("in-memory", ingest_audio)):
+            try:
+                timings = measure(ingest, content, args.iterations)
+            except Exception as e:
+                print(f"{label:>15} {path:>9}: failed ({type(e).__name__})")
+                continue
+            print(f"{label:>15} {path:>9}: mean {timings.mean():7.2f} ms  p95 {np.percentile(timings, 95):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import time
+import cv2
+import httpx
+from detector_benchmark import load_frame
+
+
+def encode_frame(image_path):
+    ok, buffer = cv2.imencode(".jpg", load_frame(image_path))
+    if not ok:
+        raise SystemExit("Could not encode test frame")
+    return buffer.tobytes()
+
+
+def run_single(client, frame, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.post("/detect-face", files={"image": ("frame.jpg", frame, "image/jpeg")})
+        response.raise_for_status()
+    return count / (time.perf_counter() - start)
+
+
+def run_batch(client, frame, count, batch_size):
+    start = time.perf_counter()
+    sent = 0
+    while sent < count:
+        size = min(batch_size, count - sent)
+        files = [("images", (f"frame{i}.jpg", frame, "image/jpeg")) for i in range(size)]
+        data = {"session_ids": [f"session-{i}" for i in range(size)]}
+        response = client.post("/detect-face/batch", files=files, data=data)
+        response.raise_for_status()
+        sent += size
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frames/sec for /detect-face vs /detect-face/batch")
+    parser.add_argument("--image", help="Frame to send (default: synthetic 640x480)")
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--url", help="Running server to hit (default: in-process app)")
+    args = parser.parse_args()
+
+    frame = encode_frame(args.image)
+
+    if args.url:
+        client = httpx.Client(base_url=args.url, timeout=60)
+    else:
+        from fastapi.testclient import TestClient
+        from api import app
+        client = TestClient(app)
+
+    with client:
+        # Warm up detectors and connections before measuring
+        run_single(client, frame, 2)
+        single_fps = run_single(client, frame, args.frames)
+        batch_fps = run_batch(client, frame, args.frames, args.batch_size)
+
+    print(f"{args.frames} frames, batch size {args.batch_size}")
+    print(f"  single requests: {single_fps:7.1f} frames/sec")
+    print(f"  batch requests:  {batch_fps:7.1f} frames/sec")
+    print(f"  speedup:         {batch_fps / single_fps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import time
+import cv2
+import numpy as np
+from detectors import CASCADE_FILES, DetectorPool
+
+
+def load_frame(image_path):
+    """
+    Load a test frame, or synthesize a 640x480 one when no image is given.
+    """
+    if image_path:
+        frame = cv2.imread(image_path)
+        if frame is None:
+            raise SystemExit(f"Could not read image: {image_path}")
+        return frame
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (9, 9), 0)
+
+
+def run_frame(gray, get_cascade):
+    """
+    The cascade work /detect-face does for one frame.
+    """
+    faces = get_cascade("face").detectMultiScale(
+        gray, scaleFactor=1.1, minNeighbors=5, minSize=(50, 50)
+    )
+    if len(faces) == 0:
+        # Still exercise the expression cascades so both paths load all three
+        h, w = gray.shape
+        faces = [(0, 0, min(w, 200), min(h, 200))]
+
+    x, y, w, h = faces[0]
+    face_gray = gray[y:y+h, x:x+w]
+    eye_cascade = get_cascade("eye")
+    smile_cascade = get_cascade("smile")
+    eye_cascade.detectMultiScale(face_gray, scaleFactor=1.1, minNeighbors=15, minSize=(15, 15))
+    smile_cascade.detectMultiScale(face_gray, scaleFactor=1.5, minNeighbors=12, minSize=(20, 20))
+    smile_cascade.detectMultiScale(face_gray, scaleFactor=1.3, minNeighbors=8, minSize=(15, 15))
+    smile_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=5, minSize=(10, 10))
+    eye_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=8, minSize=(10, 10))
+
+
+def per_call_cascade(name):
+    return cv2.CascadeClassifier(cv2.data.haarcascades + CASCADE_FILES[name])
+
+
+def measure(gray, get_cascade, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run_frame(gray, get_cascade)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame cascade latency: per-call loading vs detector pool")
+    parser.add_argument("--image", help="Frame to run detection on (default: synthetic 640x480)")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    gray = cv2.cvtColor(load_frame(args.image), cv2.COLOR_BGR2GRAY)
+
+    pool = DetectorPool()
+    pool.warm_up()
+
+    results = {
+        "per-call load": measure(gray, per_call_cascade, args.iterations),
+        "detector pool": measure(gray, pool.get, args.iterations),
+    }
+
+    print(f"Frame {gray.shape[1]}x{gray.shape[0]}, {args.iterations} iterations")
+    for label, timings in results.items():
+        print(f"{label:>14}: mean {timings.mean():7.2f} ms  "
+              f"p50 {np.percentile(timings, 50):7.2f} ms  "
+              f"p95 {np.percentile(timings, 95):7.2f} ms")
+
+    speedup = results["per-call load"].mean() / results["detector pool"].mean()
+    print(f"Speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
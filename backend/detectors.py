@@ -0,0 +1,62 @@
+import os
+import threading
+import cv2
+
+CASCADE_FILES = {
+    "face": "haarcascade_frontalface_default.xml",
+    "eye": "haarcascade_eye.xml",
+    "smile": "haarcascade_smile.xml",
+}
+
+
+class DetectorPool:
+    """
+    Haar cascades loaded once and shared between requests.
+    The XML for every cascade is read from disk a single time; each thread
+    then gets its own CascadeClassifier built from that in-memory copy,
+    because OpenCV classifiers are not safe to use from several threads.
+    """
+
+    def __init__(self, cascade_files=None, cascade_dir=None):
+        cascade_files = cascade_files or CASCADE_FILES
+        cascade_dir = cascade_dir or cv2.data.haarcascades
+
+        self._sources = {}
+        for name, filename in cascade_files.items():
+            with open(os.path.join(cascade_dir, filename), encoding="utf-8") as f:
+                self._sources[name] = f.read()
+
+        self._local = threading.local()
+
+    def get(self, name):
+        """
+        Return the calling thread's classifier for the given cascade name.
+        """
+        classifiers = getattr(self._local, "classifiers", None)
+        if classifiers is None:
+            classifiers = self._local.classifiers = {}
+
+        classifier = classifiers.get(name)
+        if classifier is None:
+            classifier = classifiers[name] = self._build(name)
+        return classifier
+
+    def warm_up(self):
+        """
+        Build every classifier for the calling thread ahead of the first frame.
+        """
+        for name in self._sources:
+            self.get(name)
+
+    def _build(self, name):
+        storage = cv2.FileStorage(
+            self._sources[name],
+            cv2.FILE_STORAGE_READ | cv2.FILE_STORAGE_MEMORY
+        )
+        classifier = cv2.CascadeClassifier()
+        if not classifier.read(storage.getFirstTopLevelNode()):
+            raise RuntimeError(f"Could not load cascade '{name}'")
+        return classifier
+
+
+detector_pool = DetectorPool()
@@ -0,0 +1,79 @@
+import asyncio
+import contextvars
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from detectors import detector_pool
+
+CV_MODES = ("process", "thread", "inline")
+
+
+def _init_cv_worker():
+    detector_pool.warm_up()
+
+
+class StageExecutor:
+    """
+    Runs blocking pipeline stages off the asyncio event loop.
+    I/O-bound stages (ffmpeg, speech recognition, TTS) go to a thread
+    pool. CPU-bound OpenCV stages go to a process pool by default so they do
+    not compete for the GIL; "thread" and "inline" are available for
+    constrained deployments and for comparison.
+    """
+
+    def __init__(self, io_workers=None, cv_workers=None, cv_mode=None):
+        self.io_workers = io_workers or int(os.getenv("IO_WORKERS", 16))
+        self.cv_workers = cv_workers or int(os.getenv("CV_WORKERS", os.cpu_count() or 4))
+        self.cv_mode = cv_mode or os.getenv("CV_EXECUTOR", "process")
+        if self.cv_mode not in CV_MODES:
+            raise ValueError(f"CV_EXECUTOR must be one of {CV_MODES}, got '{self.cv_mode}'")
+
+        self._io_pool = None
+        self._cv_pool = None
+
+    def start(self):
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io")
+        if self._cv_pool is None:
+            if self.cv_mode == "process":
+                # spawn: forking a process that already runs threads can deadlock
+                self._cv_pool = ProcessPoolExecutor(
+                    max_workers=self.cv_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_cv_worker
+                )
+            elif self.cv_mode == "thread":
+                self._cv_pool = ThreadPoolExecutor(max_workers=self.cv_workers, thread_name_prefix="cv")
+
+    def shutdown(self):
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
+            self._io_pool = None
+        if self._cv_pool is not None:
+            self._cv_pool.shutdown(wait=False, cancel_futures=True)
+            self._cv_pool = None
+
+    async def run_io(self, func, *args, **kwargs):
+        """
+        Run a blocking I/O-bound call on the thread pool, in the caller's
+        context so per-request state (stage timings) follows it.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._io_pool, partial(context.run, func, *args, **kwargs))
+
+    async def run_cv(self, func, *args):
+        """
+        Run a CPU-bound OpenCV call on the CV pool.
+        In process mode func and args must be picklable (module-level functions).
+        """
+        self.start()
+        if self.cv_mode == "inline":
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cv_pool, func, *args)
+
+
+stages = StageExecutor()
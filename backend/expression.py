@@ -0,0 +1,321 @@
+import os
+import struct
+import time
+import cv2
+import numpy as np
+from detectors import detector_pool
+from region_stats import region_stats
+
+# Frames are decoded straight to grayscale at 1/2, 1/4 or 1/8 scale (JPEG
+# decoders scale inside the DCT, far cheaper than decoding in full and
+# resizing) as long as the short side keeps at least DETECT_MIN_SIDE pixels.
+# The face cascade cannot see faces smaller than its 24 px window, so the
+# reduction is capped at MAX_REDUCTION to keep FACE_MIN_SIZE faces findable.
+DETECT_MIN_SIDE = int(os.getenv("DETECT_MIN_SIDE", 240))
+FACE_MIN_SIZE = 50
+FACE_WINDOW = 24
+MAX_REDUCTION = max(FACE_MIN_SIZE // FACE_WINDOW, 1)
+# The eye and smile cascades get the face at this width or more, decoded
+# again at a finer scale when the detection image is too coarse.
+EXPRESSION_FACE_SIDE = int(os.getenv("EXPRESSION_FACE_SIDE", 120))
+# Faces analyzed per frame, largest first; smaller ones are only counted.
+MAX_FACES = int(os.getenv("MAX_FACES", 4))
+
+REDUCED_GRAYSCALE = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# The cascade pass behind each expression count. A pass runs only when
+# classify_expression reads its count, so a face with a strong smile costs
+# one coarse smile scan instead of five full scans, with the same label.
+FEATURE_PASSES = {
+    "num_smiles_high": ("smile", {"scaleFactor": 1.5, "minNeighbors": 12, "minSize": (20, 20)}),
+    "num_smiles_medium": ("smile", {"scaleFactor": 1.3, "minNeighbors": 8, "minSize": (15, 15)}),
+    "num_smiles_low": ("smile", {"scaleFactor": 1.2, "minNeighbors": 5, "minSize": (10, 10)}),
+    "num_eyes": ("eye", {"scaleFactor": 1.1, "minNeighbors": 15, "minSize": (15, 15)}),
+    "num_eyes_loose": ("eye", {"scaleFactor": 1.2, "minNeighbors": 8, "minSize": (10, 10)}),
+}
+
+
+class ExpressionFeatures(dict):
+    """
+    Features of one face crop. Brightness statistics are computed up front;
+    eye and smile counts run their cascade pass on first access, so the
+    labels are exactly those of running every pass.
+    """
+
+    def __init__(self, face_gray, pool=detector_pool):
+        super().__init__(region_stats(face_gray))
+        self.face_gray = face_gray
+        self.pool = pool
+
+    def __missing__(self, name):
+        if name not in FEATURE_PASSES:
+            raise KeyError(name)
+        cascade, params = FEATURE_PASSES[name]
+        self[name] = len(self.pool.get(cascade).detectMultiScale(self.face_gray, **params))
+        return self[name]
+
+
+def extract_expression_features(face_gray, pool=detector_pool):
+    """
+    Compute every feature the expression classifier needs for one face.
+    Cascade passes run lazily, as classify_expression asks for them.
+    """
+    return ExpressionFeatures(face_gray, pool)
+
+
+def classify_expression(features):
+    """
+    Map extracted face features to an expression.
+    Returns expression text with emoji and color tuple (B, G, R) for visualization.
+    """
+    # Counts are read in pass order so lazy features stop at the deciding pass
+    if features["num_smiles_high"] > 0:
+        return "Happy 😄", (0, 255, 0)
+
+    if features["num_smiles_medium"] > 0:
+        return "Happy 😄", (0, 255, 0)
+
+    has_weak_smile = features["num_smiles_low"] > 0
+    num_eyes = features["num_eyes"]
+    brightness = features["brightness"]
+    upper_brightness = features["upper_brightness"]
+
+    if has_weak_smile and num_eyes >= 1:
+        return "Content 😊", (50, 255, 100)
+
+    if num_eyes < 2 and features["num_eyes_loose"] >= 1:
+        return "Sleepy 😴", (150, 150, 255)
+
+    if num_eyes == 0:
+        return "Surprised 😮", (255, 200, 0)
+
+    if num_eyes >= 2:
+        if upper_brightness < features["lower_brightness"] - 15:
+            return "Thinking 🤔", (255, 150, 50)
+
+        if brightness < 75 or (upper_brightness < features["middle_brightness"] - 12):
+            return "Serious 😐", (255, 100, 100)
+
+        if features["lower_contrast"] < 35 and 80 <= brightness <= 100:
+            return "Sad 😢", (100, 100, 255)
+
+        if brightness < 85 and not has_weak_smile:
+            return "Sad 😢", (100, 100, 255)
+
+        return "Neutral 😊", (200, 200, 200)
+
+    return "Neutral 😊", (200, 200, 200)
+
+
+def detect_expression(face_gray):
+    """
+    Expression text with emoji and color tuple (B, G, R) of one grayscale
+    face crop: the single classification path used by the API, the CLI
+    monitor and the webcam test script.
+    """
+    return classify_expression(extract_expression_features(face_gray))
+
+
+# Hindi context added to the user's message for each expression
+EXPRESSION_CONTEXT = {
+    "Happy": "उपयोगकर्ता खुश दिख रहे हैं",
+    "Content": "उपयोगकर्ता संतुष्ट दिख रहे हैं",
+    "Sad": "उपयोगकर्ता उदास दिख रहे हैं",
+    "Surprised": "उपयोगकर्ता हैरान दिख रहे हैं",
+    "Thinking": "उपयोगकर्ता सोच रहे हैं",
+    "Sleepy": "उपयोगकर्ता थके हुए दिख रहे हैं",
+    "Serious": "उपयोगकर्ता गंभीर दिख रहे हैं",
+    "Neutral": "उपयोगकर्ता शांत दिख रहे हैं"
+}
+
+
+def expression_context(expression):
+    """
+    Get a facial expression (with or without emoji) as context for the LLM.
+    Returns a Hindi context string, empty for no or unknown expressions.
+    """
+    if not expression:
+        return ""
+    context = EXPRESSION_CONTEXT.get(expression.split()[0], "")
+    return f"\n[संदर्भ: {context}]" if context else ""
+
+
+def no_face_result(error=None):
+    """
+    The /detect-face response for a frame without a usable face.
+    """
+    result = {
+        "face_detected": False,
+        "expression": "Neutral 😊",
+        "confidence": 0.0,
+        "area_ratio": 0.0,
+        "color": [200, 200, 200],
+        "face_count": 0,
+        "faces": []
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def image_size(image_data):
+    """
+    (width, height) read from a JPEG or PNG header without decoding, or None.
+    """
+    if image_data[:8] == b"\x89PNG\r\n\x1a\n" and len(image_data) >= 24:
+        return struct.unpack(">II", image_data[16:24])
+
+    if image_data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(image_data):
+        if image_data[i] != 0xFF:
+            return None
+        marker = image_data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if 0xD0 <= marker <= 0xD9 or marker == 0x01:
+            i += 2
+            continue
+        # Start-of-frame segments carry the dimensions (C4, C8 and CC are not SOF)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", image_data[i + 5:i + 9])
+            return width, height
+        i += 2 + struct.unpack(">H", image_data[i + 2:i + 4])[0]
+    return None
+
+
+def reduction_for(side, min_side, max_factor=MAX_REDUCTION):
+    """
+    The largest decode reduction (8, 4, 2 or 1, at most max_factor) that
+    keeps side >= min_side.
+    """
+    for factor in (8, 4, 2):
+        if factor <= max_factor and side // factor >= min_side:
+            return factor
+    return 1
+
+
+def decode_gray(image_data, factor=1):
+    return cv2.imdecode(np.frombuffer(image_data, np.uint8), REDUCED_GRAYSCALE[factor])
+
+
+def expression_rois(image_data, gray, factor, boxes):
+    """
+    Crop each face (full-resolution coordinates) from the coarsest decode
+    that still gives the expression cascades EXPRESSION_FACE_SIDE pixels.
+    The detection image is reused where it is fine enough, and each finer
+    decode is made at most once for all faces that need it.
+    """
+    decodes = {factor: gray}
+    crops = []
+    for box in boxes:
+        roi_factor = factor
+        while roi_factor > 1 and box[2] // roi_factor < EXPRESSION_FACE_SIDE:
+            roi_factor //= 2
+        if roi_factor not in decodes:
+            decodes[roi_factor] = decode_gray(image_data, roi_factor)
+        x, y, w, h = (v // roi_factor for v in box)
+        crops.append(decodes[roi_factor][y:y+h, x:x+w])
+    return crops
+
+
+def face_result(face_gray, box, frame_area):
+    """
+    Expression, color and box of one face, with area_ratio, the share of
+    the frame it covers.
+    """
+    expression_with_emoji, color_bgr = classify_expression(extract_expression_features(face_gray))
+    x, y, w, h = box
+    return {
+        "expression": expression_with_emoji,
+        "area_ratio": round(w * h / frame_area, 3),
+        "color": [color_bgr[2], color_bgr[1], color_bgr[0]],
+        "face_dimensions": {
+            "x": x,
+            "y": y,
+            "width": w,
+            "height": h
+        }
+    }
+
+
+def _lap(timings, stage, since):
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = now - since
+    return now
+
+
+def analyze_frame(image_data, max_faces=None, timings=None):
+    """
+    Decode one encoded image frame and detect the faces and their expressions.
+    One reduced grayscale decode and one face-cascade pass serve every face;
+    the max_faces largest (MAX_FACES by default) are analyzed and listed in
+    "faces", largest first. The top-level fields describe the dominant
+    (largest) face, so single-face clients see the same response as before.
+    face_dimensions are always in the coordinates of the uploaded image.
+    When a timings dict is given, the seconds spent decoding, detecting and
+    classifying are stored in it under "decode", "detect" and "expression".
+    Safe to call from worker threads or processes: detectors come from the
+    per-thread pool and the result is a plain JSON-serializable dict.
+    """
+    try:
+        start = time.perf_counter()
+        size = image_size(image_data)
+        factor = reduction_for(min(size), DETECT_MIN_SIDE) if size else 1
+        gray = decode_gray(image_data, factor)
+        start = _lap(timings, "decode", start)
+
+        if gray is None:
+            return no_face_result()
+
+        face_cascade = detector_pool.get("face")
+
+        min_size = max(FACE_MIN_SIZE // factor, 1)
+        faces = face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=(min_size, min_size),
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+        start = _lap(timings, "detect", start)
+
+        if len(faces) == 0:
+            return no_face_result()
+
+        boxes = sorted(
+            (tuple(int(v) * factor for v in face) for face in faces),
+            key=lambda box: box[2] * box[3],
+            reverse=True
+        )[:max_faces or MAX_FACES]
+        crops = expression_rois(image_data, gray, factor, boxes)
+
+        frame_width, frame_height = size or (gray.shape[1], gray.shape[0])
+        frame_area = frame_width * frame_height
+        results = [
+            face_result(face_gray, box, frame_area)
+            for face_gray, box in zip(crops, boxes)
+        ]
+        _lap(timings, "expression", start)
+
+        # Unsmoothed, confidence is that of a one-frame voting window;
+        # ExpressionState replaces it with the session's agreement share
+        return dict(
+            results[0],
+            confidence=1.0,
+            face_detected=True,
+            face_count=len(faces),
+            dominant_face=0,
+            faces=results
+        )
+
+    except Exception as e:
+        return no_face_result(error=str(e))
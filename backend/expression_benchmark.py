@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from detectors import detector_pool
+from expression import extract_expression_features, classify_expression
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def legacy_expression_features(face_gray, pool=detector_pool):
+    """
+    The original five-pass feature extraction, kept as the reference.
+    """
+    eye_cascade = pool.get("eye")
+    smile_cascade = pool.get("smile")
+
+    eyes = eye_cascade.detectMultiScale(face_gray, scaleFactor=1.1, minNeighbors=15, minSize=(15, 15))
+    smile_high = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.5, minNeighbors=12, minSize=(20, 20))
+    smile_medium = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.3, minNeighbors=8, minSize=(15, 15))
+    smile_low = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=5, minSize=(10, 10))
+    eyes_loose = eye_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=8, minSize=(10, 10))
+
+    height, width = face_gray.shape
+
+    return {
+        "num_eyes": len(eyes),
+        "num_eyes_loose": len(eyes_loose),
+        "num_smiles_high": len(smile_high),
+        "num_smiles_medium": len(smile_medium),
+        "num_smiles_low": len(smile_low),
+        "brightness": np.mean(face_gray),
+        "upper_brightness": np.mean(face_gray[0:int(height*0.5), :]),
+        "lower_brightness": np.mean(face_gray[int(height*0.5):, :]),
+        "middle_brightness": np.mean(face_gray[int(height*0.3):int(height*0.7), :]),
+        "lower_contrast": np.std(face_gray[int(height*0.66):, :]),
+    }
+
+
+def collect_frames(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def collect_faces(files):
+    """
+    Run /detect-face's frontal-face pass and keep the first face of every frame.
+    """
+    face_cascade = detector_pool.get("face")
+    faces = []
+    for path in files:
+        frame = cv2.imread(path)
+        if frame is None:
+            print(f"Skipping unreadable frame: {path}")
+            continue
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        found = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(50, 50))
+        if len(found) > 0:
+            x, y, w, h = found[0]
+            faces.append((path, gray[y:y+h, x:x+w]))
+    return faces
+
+
+def timed_labels(faces, extract):
+    labels = []
+    start = time.process_time()
+    for _, face_gray in faces:
+        labels.append(classify_expression(extract(face_gray))[0])
+    cpu_ms = (time.process_time() - start) * 1000
+    return labels, cpu_ms / max(len(faces), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the five-pass and lazy expression extractors")
+    parser.add_argument("frames", nargs="+", help="Frame images or directories of recorded frames")
+    args = parser.parse_args()
+
+    faces = collect_faces(collect_frames(args.frames))
+    if not faces:
+        raise SystemExit("No faces found in the given frames")
+
+    detector_pool.warm_up()
+    legacy_labels, legacy_ms = timed_labels(faces, legacy_expression_features)
+    lazy_labels, lazy_ms = timed_labels(faces, extract_expression_features)
+
+    mismatches = [
+        (path, old, new)
+        for (path, _), old, new in zip(faces, legacy_labels, lazy_labels)
+        if old != new
+    ]
+
+    print(f"Faces analysed: {len(faces)}")
+    print(f"  five-pass:   {legacy_ms:7.2f} ms CPU per face")
+    print(f"  lazy:        {lazy_ms:7.2f} ms CPU per face")
+    print(f"  speedup:     {legacy_ms / lazy_ms:.2f}x")
+    print(f"Label agreement: {len(faces) - len(mismatches)}/{len(faces)}")
+    for path, old, new in mismatches:
+        print(f"  {path}: {old} -> {new}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+
+
+class ExpressionState:
+    """
+    Smoothed expression of one camera stream.
+    The last `window` per-frame labels are kept in a ring buffer (None for
+    frames without a face). The stable label only changes when another label
+    holds at least switch_share of the window and outvotes the current one,
+    so a single misclassified frame never flips it. Confidence is the share
+    of the window that agrees with the stable label, so it also starts low
+    while the window is still filling.
+    """
+
+    def __init__(self, window, switch_share):
+        self.switch_share = switch_share
+        self.frames = deque(maxlen=window)
+        self.label = None
+        self.colors = {}
+        self.confidence = 0.0
+        self.face_detected = False
+        self.last_result = None
+        self.skipped = 0
+        self.last_active = time.monotonic()
+
+    def observe(self, result):
+        """
+        Add one /detect-face result and return it with the smoothed fields.
+        """
+        label = result["expression"] if result.get("face_detected") else None
+        self.frames.append(label)
+        if label is not None:
+            self.colors[label] = result["color"]
+
+        votes = Counter(frame for frame in self.frames if frame is not None)
+        if not votes:
+            self.label = None
+        elif self.label is None:
+            self.label = votes.most_common(1)[0][0]
+        else:
+            winner, count = votes.most_common(1)[0]
+            if count >= self.switch_share * len(self.frames) and count > votes[self.label]:
+                self.label = winner
+
+        present = sum(votes.values())
+        self.face_detected = label is not None or present * 2 > len(self.frames)
+        self.confidence = round(votes[self.label] / self.frames.maxlen, 2) if self.label else 0.0
+
+        smoothed = dict(result)
+        smoothed["frame_expression"] = result["expression"]
+        smoothed["face_detected"] = self.face_detected
+        smoothed["confidence"] = 0.0
+        if self.face_detected and self.label is not None:
+            smoothed["expression"] = self.label
+            smoothed["color"] = self.colors[self.label]
+            smoothed["confidence"] = self.confidence
+        self.last_result = smoothed
+        self.skipped = 0
+        return smoothed
+
+    def is_stable(self, threshold):
+        return (
+            self.label is not None
+            and len(self.frames) == self.frames.maxlen
+            and self.frames[-1] == self.label
+            and self.confidence >= threshold
+        )
+
+
+class ExpressionStateStore:
+    """
+    Per-session expression smoothing for /detect-face and the LLM context.
+    While a session's label is stable (confidence >= stable_confidence over a
+    full window), up to stable_skip frames in a row are answered from the
+    smoothed state without running detection; the next frame is analyzed
+    again, so a change is picked up within stable_skip + 1 frames.
+    """
+
+    def __init__(self, window=None, switch_share=None, stable_confidence=None,
+                 stable_skip=None, max_sessions=None, idle_timeout=None):
+        self.window = window or int(os.getenv("EXPRESSION_WINDOW", 7))
+        self.switch_share = switch_share or float(os.getenv("EXPRESSION_SWITCH_SHARE", 0.6))
+        self.stable_confidence = stable_confidence or float(os.getenv("EXPRESSION_STABLE_CONFIDENCE", 0.8))
+        self.stable_skip = stable_skip if stable_skip is not None else int(os.getenv("EXPRESSION_STABLE_SKIP", 2))
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_SESSIONS", 1000))
+        self.idle_timeout = idle_timeout or float(os.getenv("EXPRESSION_IDLE_TIMEOUT", 60))
+
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, session_id):
+        """
+        The session's last smoothed result if this frame may skip detection, else None.
+        """
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is None or state.skipped >= self.stable_skip or not state.is_stable(self.stable_confidence):
+                return None
+            state.skipped += 1
+            state.last_active = time.monotonic()
+            return dict(state.last_result, skipped=True)
+
+    def observe(self, session_id, result):
+        with self._lock:
+            state = self._touch(session_id)
+            smoothed = state.observe(result)
+            smoothed["stable"] = state.is_stable(self.stable_confidence)
+            smoothed["skipped"] = False
+            self._evict()
+            return smoothed
+
+    def current(self, session_id):
+        """
+        (label, confidence) of the session's stable expression, or (None, 0.0).
+        """
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is None or not state.face_detected or time.monotonic() - state.last_active > self.idle_timeout:
+                return None, 0.0
+            return state.label, state.confidence
+
+    def reset(self, session_id):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            self._evict()
+            return {"active": len(self._states)}
+
+    def _touch(self, session_id):
+        state = self._states.get(session_id)
+        if state is None:
+            state = self._states[session_id] = ExpressionState(self.window, self.switch_share)
+        else:
+            self._states.move_to_end(session_id)
+        state.last_active = time.monotonic()
+        return state
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._states:
+            session_id, state = next(iter(self._states.items()))
+            if not (now - state.last_active > self.idle_timeout or len(self._states) > self.max_sessions):
+                break
+            del self._states[session_id]
+
+
+expression_states = ExpressionStateStore()
@@ -0,0 +1,54 @@
+import argparse
+import time
+from expression import analyze_frame
+from expression_benchmark import collect_frames
+from expression_state import ExpressionStateStore
+
+
+def changes(labels):
+    return sum(1 for a, b in zip(labels, labels[1:]) if a != b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Label flicker and detection work: per-frame vs smoothed expressions")
+    parser.add_argument("frames", nargs="+", help="Frame images or directories of recorded frames, in camera order")
+    parser.add_argument("--window", type=int, default=None)
+    parser.add_argument("--skip", type=int, default=None, help="frames answered from a stable state in a row")
+    args = parser.parse_args()
+
+    frames = []
+    for path in collect_frames(args.frames):
+        with open(path, "rb") as f:
+            frames.append(f.read())
+
+    start = time.perf_counter()
+    raw = [analyze_frame(image_data) for image_data in frames]
+    raw_seconds = time.perf_counter() - start
+
+    store = ExpressionStateStore(window=args.window, stable_skip=args.skip)
+    smoothed = []
+    start = time.perf_counter()
+    for image_data in frames:
+        result = store.cached("benchmark")
+        if result is None:
+            result = store.observe("benchmark", analyze_frame(image_data))
+        smoothed.append(result)
+    smoothed_seconds = time.perf_counter() - start
+
+    raw_labels = [r["expression"] if r["face_detected"] else None for r in raw]
+    smoothed_labels = [r["expression"] if r["face_detected"] else None for r in smoothed]
+    skipped = sum(1 for r in smoothed if r["skipped"])
+    confidences = [r["confidence"] for r in smoothed if r["face_detected"]]
+
+    print(f"{len(frames)} frames, window {store.window}, up to {store.stable_skip} skipped in a row")
+    print(f"per-frame: {changes(raw_labels):3d} label changes, {raw_seconds * 1000 / len(frames):6.1f} ms/frame")
+    print(
+        f"smoothed:  {changes(smoothed_labels):3d} label changes, {smoothed_seconds * 1000 / len(frames):6.1f} ms/frame,"
+        f" {skipped} frames skipped detection"
+    )
+    if confidences:
+        print(f"smoothed confidence: mean {sum(confidences) / len(confidences):.2f}")
+
+
+if __name__ == "__main__":
+    main()
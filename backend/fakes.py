@@ -0,0 +1,167 @@
+import asyncio
+import itertools
+import math
+import random
+import threading
+import time
+from typing import Union
+import speech_recognition as sr
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+from sessions import estimate_tokens
+from asr import audio_seconds
+
+_rng = random.Random()
+
+
+def sample_latency(spec):
+    """
+    Seconds to wait for a latency given as a number or a distribution spec:
+    "0.2", "uniform:LOW,HIGH", "normal:MEAN,STD" or "lognormal:MEDIAN,SIGMA".
+    Hosted services have long right tails, which lognormal models best.
+    """
+    if isinstance(spec, (int, float)):
+        return spec
+    kind, _, params = spec.partition(":")
+    if not params:
+        return float(kind)
+    a, b = (float(value) for value in params.split(","))
+    if kind == "uniform":
+        return _rng.uniform(a, b)
+    if kind == "normal":
+        return max(_rng.gauss(a, b), 0.0)
+    if kind == "lognormal":
+        return _rng.lognormvariate(math.log(a), b)
+    raise ValueError(f"Unknown latency distribution '{kind}'")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Local stand-in for the Gemini chat model.
+    Latency grows with prompt size like a hosted model's prefill does:
+    base_latency + per_token_latency * prompt tokens, and streamed replies
+    arrive one word every token_interval seconds. base_latency may also be
+    a sample_latency distribution spec. Every prompt size is recorded in
+    prompt_tokens for benchmarks to inspect. unique_replies numbers every
+    reply so load tests are not answered from the audio cache.
+    """
+
+    response: str = "नमस्ते! मैं आपकी कैसे मदद कर सकती हूँ?"
+    base_latency: Union[float, str] = 0.05
+    per_token_latency: float = 0.0002
+    token_interval: float = 0.0
+    unique_replies: bool = False
+    prompt_tokens: list = Field(default_factory=list)
+    replies: itertools.count = Field(default_factory=itertools.count)
+
+    @property
+    def _llm_type(self):
+        return "fake-chat"
+
+    def _prefill_seconds(self, messages):
+        tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        self.prompt_tokens.append(tokens)
+        return sample_latency(self.base_latency) + self.per_token_latency * tokens
+
+    def _prefill(self, messages):
+        time.sleep(self._prefill_seconds(messages))
+
+    def _reply(self):
+        if self.unique_replies:
+            return f"{self.response} ({next(self.replies)})"
+        return self.response
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._prefill(messages)
+        response = self._reply()
+        time.sleep(self.token_interval * len(response.split()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self._prefill(messages)
+        words = self._reply().split(" ")
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.token_interval)
+            text = word if i == len(words) - 1 else word + " "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+    # Awaiting like an async HTTP client, so concurrent calls overlap on one event loop
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self._prefill_seconds(messages))
+        response = self._reply()
+        await asyncio.sleep(self.token_interval * len(response.split()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self._prefill_seconds(messages))
+        words = self._reply().split(" ")
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            text = word if i == len(words) - 1 else word + " "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+class StubTTSEngine:
+    """
+    Offline stand-in for gTTS: sleeps like a network call and returns
+    deterministic placeholder bytes for the text. latency is a number or a
+    sample_latency distribution spec.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=0.0, per_char_latency=0.0):
+        sample_latency(latency)
+        self.latency = latency
+        self.per_char_latency = per_char_latency
+        self.calls = []
+
+    def synthesize(self, text):
+        self.calls.append(text)
+        time.sleep(sample_latency(self.latency) + self.per_char_latency * len(text))
+        return b"ID3" + text.encode("utf-8")
+
+
+class StubASREngine:
+    """
+    Offline stand-in for speech recognition: returns a fixed transcript after
+    latency + rtf * audio seconds, and treats empty audio as unrecognized.
+    Calls share `streams` compute streams (one, like a single model instance;
+    more, like a hosted service), and a batch pays the fixed latency once,
+    like a batched model would. latency is a number or a sample_latency
+    distribution spec.
+    """
+
+    name = "stub"
+
+    def __init__(self, transcript="नमस्ते, आप कैसे हैं?", latency=0.0, rtf=0.0, streams=1):
+        sample_latency(latency)
+        self.transcript = transcript
+        self.latency = latency
+        self.rtf = rtf
+        self.calls = []
+        self._streams = threading.BoundedSemaphore(streams)
+
+    def warm_up(self):
+        pass
+
+    def transcribe(self, audio_data):
+        return self.transcribe_batch([audio_data])[0]
+
+    def transcribe_batch(self, audios):
+        seconds = [audio_seconds(audio_data) for audio_data in audios]
+        with self._streams:
+            self.calls.append(len(audios))
+            time.sleep(sample_latency(self.latency) + self.rtf * sum(seconds))
+        return [self.transcript if s > 0 else sr.UnknownValueError() for s in seconds]
@@ -1,43 +1,244 @@
 from typing_extensions import TypedDict
 from typing import Annotated
 from langgraph.graph.message import add_messages
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from langchain.chat_models import init_chat_model
 from dotenv import load_dotenv
+from sessions import estimate_tokens
+import asyncio
 import os
+import threading
 
 # Load environment variables
 load_dotenv()
 
-# Initialize LLM with explicit API key from environment
+# Provider calls in flight at once, and how long one may take
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 32))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 30))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+
 llm = None
+_llm_lock = threading.Lock()
+_thread_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+# Created on first use so it belongs to the server's event loop
+_task_slots = None
+
+
+def create_llm():
+    """
+    Build the chat model selected by LLM_ENGINE ("gemini" or "stub").
+    """
+    if os.getenv("LLM_ENGINE", "gemini") == "stub":
+        # Local stand-in for load tests: no network, configurable latency
+        from fakes import FakeChatModel
+        return FakeChatModel(
+            base_latency=os.getenv("STUB_LLM_LATENCY", "0.05"),
+            token_interval=float(os.getenv("STUB_LLM_TOKEN_INTERVAL", 0)),
+            unique_replies=os.getenv("STUB_LLM_UNIQUE_REPLIES", "0") != "0"
+        )
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found in environment variables")
+    return init_chat_model(
+        model_provider="google_genai",
+        model="gemini-2.5-flash-lite",
+        api_key=api_key,
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES
+    )
+
 
 def get_llm():
+    """
+    The shared chat model, created once (the API does it at startup) and
+    reused by every call from every thread, together with its HTTP client
+    and connections.
+    """
     global llm
     if llm is None:
-        # Reload environment variables to get latest values
-        load_dotenv(override=True)
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not found in environment variables")
-        llm = init_chat_model(model_provider="google_genai", model="gemini-2.5-flash-lite", api_key=api_key)
+        with _llm_lock:
+            if llm is None:
+                llm = create_llm()
     return llm
 
+
+def call_llm(messages):
+    """
+    Blocking provider call for the CLI and worker threads.
+    """
+    with _thread_slots:
+        return get_llm().invoke(messages)
+
+
+async def acall_llm(messages):
+    """
+    Provider call for the event loop: at most LLM_MAX_CONCURRENCY in flight
+    and each bounded by LLM_TIMEOUT, so concurrent requests overlap their
+    wait for the model instead of holding a thread each.
+    """
+    global _task_slots
+    if _task_slots is None:
+        _task_slots = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    async with _task_slots:
+        return await asyncio.wait_for(get_llm().ainvoke(messages), LLM_TIMEOUT)
+
+
+# Older turns are folded into a running summary once the history passes this size
+SUMMARY_TRIGGER_TOKENS = int(os.getenv("SUMMARY_TRIGGER_TOKENS", 2000))
+SUMMARY_KEEP_MESSAGES = int(os.getenv("SUMMARY_KEEP_MESSAGES", 6))
+
+SUMMARY_PROMPT = """आप एक बातचीत का सारांश बनाने वाले सहायक हैं।
+पिछले सारांश और नई बातचीत को मिलाकर एक छोटा, अद्यतन सारांश हिंदी में लिखें।
+उपयोगकर्ता के बारे में महत्वपूर्ण तथ्य, उनकी भावनाएँ और अधूरे प्रश्न बनाए रखें।"""
+
+
 class State(TypedDict):
     messages: Annotated[list, add_messages]
+    summary: str
 
 
-def chatbot(state: State):
+def summary_request(conversation, summary=""):
+    """
+    The prompt that folds the oldest turns of a conversation (role/content
+    dicts) into the running summary and how many messages it folds, or None
+    while the history is short enough.
+    Only the newly folded turns and the previous summary are sent, so each
+    update costs the same no matter how long the session has been running.
+    """
+    tokens = sum(estimate_tokens(m["content"]) for m in conversation)
+    if tokens <= SUMMARY_TRIGGER_TOKENS or len(conversation) <= SUMMARY_KEEP_MESSAGES:
+        return None
+
+    # Keep the remaining window starting on a user turn
+    cut = len(conversation) - SUMMARY_KEEP_MESSAGES
+    while cut < len(conversation) - 1 and conversation[cut]["role"] != "user":
+        cut += 1
+    folded = conversation[:cut]
+
+    speakers = {"user": "उपयोगकर्ता", "assistant": "सहायक"}
+    transcript = "\n".join(f"{speakers.get(m['role'], m['role'])}: {m['content']}" for m in folded)
+    previous = summary or "कोई नहीं"
+
+    prompt = [
+        SystemMessage(content=SUMMARY_PROMPT),
+        HumanMessage(content=f"पिछला सारांश: {previous}\n\nनई बातचीत:\n{transcript}")
+    ]
+    return prompt, cut
+
+
+def summarize_history(conversation, summary=""):
+    """
+    Fold the oldest turns into the running summary once the history is too
+    long. Returns (new summary, number of oldest messages it replaces), or
+    None when nothing needs folding.
+    Not part of the graph: callers run it after the reply has been delivered,
+    so the extra LLM call never adds to a turn's latency.
+    """
+    request = summary_request(conversation, summary)
+    if request is None:
+        return None
+    prompt, folded = request
+    return call_llm(prompt).content, folded
+
+
+async def asummarize_history(conversation, summary=""):
+    """
+    summarize_history on the event loop.
+    """
+    request = summary_request(conversation, summary)
+    if request is None:
+        return None
+    prompt, folded = request
+    return (await acall_llm(prompt)).content, folded
+
+
+def chat_prompt(state: State):
     system_prompt = SystemMessage(content="""You are a helpful female AI assistant that speaks Hindi.""")
-    message = get_llm().invoke([system_prompt] + state["messages"])
+    prompt = [system_prompt]
+    if state.get("summary"):
+        prompt.append(SystemMessage(content=f"अब तक की बातचीत का सारांश: {state['summary']}"))
+    return prompt + state["messages"]
+
+
+def chatbot(state: State):
+    return {"messages": call_llm(chat_prompt(state))}
+
 
-    return {"messages": message}
+async def achatbot(state: State):
+    return {"messages": await acall_llm(chat_prompt(state))}
 
 graph_builder = StateGraph(State)
 
-graph_builder.add_node("chatbot", chatbot)
+# Each node runs the blocking call under graph.stream (CLI) and the async
+# one under graph.astream (API)
+graph_builder.add_node("chatbot", RunnableLambda(chatbot, afunc=achatbot))
 graph_builder.add_edge(START, "chatbot")
 graph_builder.add_edge("chatbot", END)
 
-graph = graph_builder.compile()
\ No newline at end of file
+graph = graph_builder.compile()
+
+
+class ResponseCollector:
+    """
+    Turns graph stream events into chatbot tokens and the final response text.
+    """
+
+    modes = ["messages", "values"]
+
+    def __init__(self, conversation, summary):
+        self.conversation = conversation
+        self.summary = summary
+        self.response_text = None
+
+    @property
+    def input(self):
+        return {"messages": self.conversation, "summary": self.summary}
+
+    def feed(self, mode, payload):
+        """
+        Return the token text of a chatbot message chunk, else None.
+        """
+        if mode == "messages":
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") == "chatbot" and isinstance(chunk.content, str) and chunk.content:
+                return chunk.content
+            return None
+
+        if "messages" in payload:
+            last_message = payload["messages"][-1]
+            if hasattr(last_message, 'type') and last_message.type == "ai":
+                self.response_text = last_message.content
+        return None
+
+    def final(self):
+        return self.response_text
+
+
+def stream_response(conversation, summary=""):
+    """
+    Run the conversation through the graph, yielding ("token", text) for every
+    chatbot token as it is generated and finally ("final", response_text) with
+    the full AI message text. The running summary is only read here; fold new
+    turns into it with summarize_history once the reply is out.
+    """
+    collector = ResponseCollector(conversation, summary)
+    for mode, payload in graph.stream(collector.input, stream_mode=collector.modes):
+        token = collector.feed(mode, payload)
+        if token:
+            yield "token", token
+    yield "final", collector.final()
+
+
+async def astream_response(conversation, summary=""):
+    """
+    stream_response on the event loop: the LLM calls are awaited, so many
+    conversations wait for the provider at once without a thread each.
+    """
+    collector = ResponseCollector(conversation, summary)
+    async for mode, payload in graph.astream(collector.input, stream_mode=collector.modes):
+        token = collector.feed(mode, payload)
+        if token:
+            yield "token", token
+    yield "final", collector.final()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+import httpx
+import numpy as np
+from batch_benchmark import encode_frame
+
+
+def wait_for_server(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server at {url} did not come up")
+
+
+def saturate(url, frame, stop, counter):
+    with httpx.Client(base_url=url, timeout=60) as client:
+        while not stop.is_set():
+            response = client.post("/detect-face", files={"image": ("frame.jpg", frame, "image/jpeg")})
+            response.raise_for_status()
+            counter.append(1)
+
+
+def run_mode(mode, args, frame):
+    port = args.port
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, CV_EXECUTOR=mode)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    try:
+        wait_for_server(url)
+
+        stop = threading.Event()
+        frames_done = []
+        workers = [
+            threading.Thread(target=saturate, args=(url, frame, stop, frames_done), daemon=True)
+            for _ in range(args.clients)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Let the detection load ramp up before probing /health
+        time.sleep(1)
+        latencies = []
+        start = time.time()
+        with httpx.Client(base_url=url, timeout=60) as client:
+            while time.time() - start < args.duration:
+                probe_start = time.perf_counter()
+                client.get("/health")
+                latencies.append((time.perf_counter() - probe_start) * 1000)
+                time.sleep(0.05)
+        elapsed = time.time() - start
+
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        latencies = np.array(latencies)
+        print(f"{mode:>8}: /health p50 {np.percentile(latencies, 50):7.1f} ms  "
+              f"p99 {np.percentile(latencies, 99):7.1f} ms  "
+              f"/detect-face {len(frames_done) / elapsed:6.1f} frames/sec")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/health latency while /detect-face is saturated")
+    parser.add_argument("--image", help="Frame to send (default: synthetic 640x480)")
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"],
+                        help="CV_EXECUTOR modes to compare")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent /detect-face clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of /health probing per mode")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    frame = encode_frame(args.image)
+    print(f"{args.clients} clients saturating /detect-face, probing /health for {args.duration:.0f}s")
+    for mode in args.modes:
+        run_mode(mode, args, frame)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 from dotenv import load_dotenv
 import speech_recognition as sr
-from graph import graph
+from graph import graph, summarize_history
+from expression import detect_expression, expression_context
+from tracking import FaceTracker, AdaptiveRate
+from expression_state import expression_states
+from asr import get_asr_engine, transcribe_utterances
+from vad import vad
+from tts import get_tts_engine
+from voice_pipeline import VoicePipeline
 from gtts import gTTS
 import pygame
 import os
+import argparse
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import cv2
-import numpy as np
 
 load_dotenv()
 
@@ -17,113 +26,17 @@ current_expression = {"expression": "Neutral", "detected": False}
 expression_lock = threading.Lock()
 
 
-def detect_expression_from_face(face_gray, face_color):
-    """
-    Enhanced expression detection based on multiple facial features.
-    Returns expression text with emoji and color tuple (B, G, R) for visualization.
-    """
-    # Load feature detectors
-    eye_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_eye.xml'
-    )
-    smile_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_smile.xml'
-    )
-    
-    # Detect facial features with adjusted parameters
-    eyes = eye_cascade.detectMultiScale(face_gray, scaleFactor=1.1, minNeighbors=15, minSize=(15, 15))
-    
-    # Detect smile with multiple sensitivity levels - VERY SENSITIVE for happy detection
-    smile_high = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.5, minNeighbors=12, minSize=(20, 20))
-    smile_medium = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.3, minNeighbors=8, minSize=(15, 15))
-    smile_low = smile_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=5, minSize=(10, 10))
-    
-    # Analyze face brightness (can indicate mood)
-    brightness = np.mean(face_gray)
-    
-    # Get face dimensions for analysis
-    height, width = face_gray.shape
-    
-    # Analyze upper and lower face regions
-    upper_face = face_gray[0:int(height*0.5), :]
-    lower_face = face_gray[int(height*0.5):, :]
-    
-    # Analyze specific regions for better detection
-    middle_face = face_gray[int(height*0.3):int(height*0.7), :]
-    lower_third = face_gray[int(height*0.66):, :]
-    
-    # Detect eyes with looser constraints for sleepy detection
-    eyes_loose = eye_cascade.detectMultiScale(face_gray, scaleFactor=1.2, minNeighbors=8, minSize=(10, 10))
-    
-    # Calculate expression based on features
-    num_eyes = len(eyes)
-    num_smiles_high = len(smile_high)
-    num_smiles_medium = len(smile_medium)
-    num_smiles_low = len(smile_low)
-    has_weak_smile = len(smile_low) > 0
-    
-    # Calculate brightness metrics
-    upper_brightness = np.mean(upper_face)
-    lower_brightness = np.mean(lower_face)
-    middle_brightness = np.mean(middle_face)
-    lower_contrast = np.std(lower_third)
-    
-    # Expression detection logic with enhanced sensitivity
-    
-    # 1. HAPPY - Any smile detected at any level
-    if num_smiles_high > 0:
-        return "Happy 😄", (0, 255, 0)
-    
-    if num_smiles_medium > 0:
-        return "Happy 😄", (0, 255, 0)
-    
-    # 2. CONTENT - Weak smile with visible eyes
-    if num_smiles_low > 0 and num_eyes >= 1:
-        return "Content 😊", (50, 255, 100)
-    
-    # 3. SLEEPY - Eyes barely open
-    if num_eyes < 2 and len(eyes_loose) >= 1:
-        return "Sleepy 😴", (150, 150, 255)
-    
-    # 4. NO EYES DETECTED - Surprised
-    if num_eyes == 0:
-        return "Surprised 😮", (255, 200, 0)
-    
-    # 5. EYES DETECTED - Analyze further for sad, thinking, serious, or neutral
-    if num_eyes >= 2:
-        # Check for THINKING - Furrowed brow (upper face darker)
-        if upper_brightness < lower_brightness - 15:
-            return "Thinking 🤔", (255, 150, 50)
-        
-        # Check for ANGRY/SERIOUS - Very dark overall or high contrast
-        if brightness < 75 or (upper_brightness < middle_brightness - 12):
-            return "Serious 😐", (255, 100, 100)
-        
-        # Check for SAD - Low contrast in lower face, medium brightness
-        if lower_contrast < 35 and 80 <= brightness <= 100:
-            return "Sad 😢", (100, 100, 255)
-        
-        # Check for subtle sad - slightly lower brightness with no smile
-        if brightness < 85 and not has_weak_smile:
-            return "Sad �", (100, 100, 255)
-        
-        # Default neutral
-        return "Neutral 😊", (200, 200, 200)
-    
-    # Fallback
-    return "Neutral 😊", (200, 200, 200)
-
-
 def monitor_facial_expression():
     """
     Background thread to continuously monitor user's facial expression.
-    Updates global current_expression variable with expression and color.
+    Follows the face between frames instead of searching every frame, samples
+    as often as the CPU budget allows, and replaces current_expression under
+    the lock only once the new state is ready.
     """
     global current_expression
     
-    face_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-    )
+    tracker = FaceTracker()
+    rate = AdaptiveRate()
     
     cap = cv2.VideoCapture(0)
     
@@ -131,33 +44,39 @@ def monitor_facial_expression():
         print("⚠️ Could not open camera for expression monitoring")
         return
     
+    # Keep only the newest frame queued in the driver
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     print("📹 Expression monitoring started")
     
     try:
         while True:
-            ret, frame = cap.read()
+            # grab() dequeues a frame without decoding it, so frames between samples are skipped cheaply
+            if not cap.grab() or not rate.due():
+                continue
+            
+            start = time.perf_counter()
+            ret, frame = cap.retrieve()
             if not ret:
                 continue
             
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+            face = tracker.update(gray)
+            
+            if face is not None:
+                x, y, w, h = face
+                expression_with_emoji, color = detect_expression(gray[y:y+h, x:x+w])
+                result = {"face_detected": True, "expression": expression_with_emoji, "color": color}
+            else:
+                result = {"face_detected": False, "expression": current_expression["expression"], "color": None}
+            
+            # Vote over recent frames so one misread frame does not change the LLM context
+            smoothed = expression_states.observe("cli", result)
+            state = {"expression": smoothed["expression"], "detected": smoothed["face_detected"]}
             
             with expression_lock:
-                if len(faces) > 0:
-                    # Get first detected face
-                    x, y, w, h = faces[0]
-                    face_gray = gray[y:y+h, x:x+w]
-                    face_color = frame[y:y+h, x:x+w]
-                    
-                    # Detect expression (returns expression with emoji and color)
-                    expression_with_emoji, color = detect_expression_from_face(face_gray, face_color)
-                    current_expression["expression"] = expression_with_emoji
-                    current_expression["detected"] = True
-                else:
-                    current_expression["detected"] = False
+                current_expression = state
             
-            # Small delay to reduce CPU usage
-            threading.Event().wait(0.5)
+            rate.record(time.perf_counter() - start)
             
     except Exception as e:
         print(f"Expression monitoring error: {e}")
@@ -169,31 +88,12 @@ def get_expression_context():
     """
     Get current facial expression as context for LLM.
     Returns a Hindi context string.
-    Handles expressions with or without emojis.
     """
     with expression_lock:
         if not current_expression["detected"]:
             return ""
-        
-        expr = current_expression["expression"]
-        
-        # Remove emojis from expression for mapping (keep only text part)
-        expr_clean = expr.split()[0] if expr else ""
-        
-        # Map expressions to Hindi context
-        expression_map = {
-            "Happy": "उपयोगकर्ता खुश दिख रहे हैं",
-            "Content": "उपयोगकर्ता संतुष्ट दिख रहे हैं",
-            "Sad": "उपयोगकर्ता उदास दिख रहे हैं",
-            "Surprised": "उपयोगकर्ता हैरान दिख रहे हैं",
-            "Thinking": "उपयोगकर्ता सोच रहे हैं",
-            "Sleepy": "उपयोगकर्ता थके हुए दिख रहे हैं",
-            "Serious": "उपयोगकर्ता गंभीर दिख रहे हैं",
-            "Neutral": "उपयोगकर्ता शांत दिख रहे हैं"
-        }
-        
-        context = expression_map.get(expr_clean, "")
-        return f"\n[संदर्भ: {context}]" if context else ""
+        return expression_context(current_expression["expression"])
+
 
 def speak_hindi(text):
     """Convert text to speech in Hindi and play it"""
@@ -218,6 +118,10 @@ def main():
     
     recognizer = sr.Recognizer()
     microphone = sr.Microphone()
+    asr_engine = get_asr_engine()
+    asr_engine.warm_up()
+    summary = ""
+    summary_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
 
     with microphone as source:
         recognizer.adjust_for_ambient_noise(source)
@@ -226,9 +130,13 @@ def main():
         while True:
             print("कृपया बोलें...")  # "Please speak..." in Hindi
             audio = recognizer.listen(source)
+            utterances = vad.split(audio)
+            if not utterances:
+                # Only silence or background noise: listen again without calling ASR
+                continue
 
             try:
-                text = recognizer.recognize_google(audio, language="hi-IN")
+                text = transcribe_utterances(asr_engine, utterances)
                 print("आपने कहा:", text)
                 
                 # Add facial expression context to the user message
@@ -241,7 +149,7 @@ def main():
                 messages.append({"role": "user", "content": user_message})
                 
                 response_text = None
-                for event in graph.stream({"messages": messages}, stream_mode="values"):
+                for event in graph.stream({"messages": messages, "summary": summary}, stream_mode="values"):
                     if "messages" in event:
                         last_message = event["messages"][-1]
                         # Only process assistant messages
@@ -252,7 +160,14 @@ def main():
                 # Speak only the final assistant response
                 if response_text:
                     messages.append({"role": "assistant", "content": response_text})
+                    
+                    # Fold older turns into the running summary while the reply is spoken
+                    folding = summary_pool.submit(summarize_history, list(messages), summary)
                     speak_hindi(response_text)
+                    result = folding.result()
+                    if result is not None:
+                        summary, folded = result
+                        del messages[:folded]
 
             except sr.UnknownValueError:
                 error_msg = "क्षमा करें, मैं आपकी बात समझ नहीं पाया। कृपया फिर से प्रयास करें।"
@@ -263,4 +178,28 @@ def main():
                 print(error_msg)
                 return
 
-main()
\ No newline at end of file
+def main_pipelined():
+    """
+    Hands-free mode: listening, recognition, generation and playback overlap,
+    and talking over the assistant interrupts its reply.
+    """
+    expression_thread = threading.Thread(target=monitor_facial_expression, daemon=True)
+    expression_thread.start()
+    
+    recognizer = sr.Recognizer()
+    asr_engine = get_asr_engine()
+    asr_engine.warm_up()
+    
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source)
+        recognizer.pause_threshold = 1
+        VoicePipeline(recognizer, source, asr_engine, get_tts_engine(), get_expression_context).run()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hindi voice assistant (CLI)")
+    parser.add_argument("--pipelined", action="store_true", help="overlap listening, generation and playback; allow barge-in")
+    args = parser.parse_args()
+    if args.pipelined:
+        main_pipelined()
+    else:
+        main()
@@ -0,0 +1,233 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+
+# Latency buckets in seconds, from a cached cascade pass to a slow LLM reply
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (stage, seconds) pairs of the current request, for its Server-Timing header
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _format_labels(names, values, **extra):
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    """
+    Monotonic count per label tuple.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """
+    Value per label tuple that goes up and down, e.g. calls in flight.
+    """
+
+    kind = "gauge"
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    """
+    Latency distribution per label tuple in cumulative buckets.
+    Observing is one bisect and three additions under a lock.
+    """
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, ([*counts], total, count)) for labels, (counts, total, count) in self._series.items())
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, le=bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {count}")
+        return lines
+
+
+class _Stage:
+    """
+    Times one pipeline stage: in-flight gauge while it runs, then its
+    duration in the histogram and the request's Server-Timing, or its
+    exception type in the error counter.
+    """
+
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.metrics.stage_in_flight.inc((self.name,))
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        metrics = self.metrics
+        metrics.stage_in_flight.dec((self.name,))
+        # GeneratorExit: a consumer stopped reading a timed generator early
+        if exc_type is not None and exc_type is not GeneratorExit:
+            metrics.stage_errors.inc((self.name, exc_type.__name__))
+        metrics.stage_seconds.observe((self.name,), seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((self.name, seconds))
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class Metrics:
+    """
+    Per-stage latency histograms, in-flight gauges and error counters, plus
+    per-route request latency, rendered in the Prometheus text format.
+    METRICS_ENABLED=0 turns every stage() into a shared no-op and the
+    middleware into a pass-through.
+    """
+
+    def __init__(self, enabled=None):
+        self.enabled = enabled if enabled is not None else os.getenv("METRICS_ENABLED", "1") != "0"
+
+        self.stage_seconds = Histogram("assistant_stage_seconds", "Time spent in each pipeline stage", ("stage",))
+        self.stage_in_flight = Gauge("assistant_stage_in_flight", "Pipeline stage calls currently running", ("stage",))
+        self.stage_errors = Counter("assistant_stage_errors_total", "Pipeline stage calls that raised", ("stage", "error"))
+        self.request_seconds = Histogram(
+            "assistant_http_request_seconds", "HTTP request latency until the response completes",
+            ("method", "route", "status")
+        )
+        self.requests_in_flight = Gauge("assistant_http_requests_in_flight", "HTTP requests currently being served")
+
+    def stage(self, name):
+        """
+        Context manager timing one stage; safe in coroutines and worker threads.
+        """
+        return _Stage(self, name) if self.enabled else _NO_STAGE
+
+    def render(self):
+        lines = []
+        for metric in (self.stage_seconds, self.stage_in_flight, self.stage_errors,
+                       self.request_seconds, self.requests_in_flight):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def server_timing(timings, total):
+    """
+    Server-Timing header value: the summed duration of each stage, in first
+    seen order, then the whole request up to its response headers.
+    """
+    durations = {}
+    for name, seconds in list(timings):
+        durations[name] = durations.get(name, 0.0) + seconds
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in durations.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route and adding a
+    Server-Timing header with the stages timed while the request ran.
+    Stages that finish after the headers are sent (the rest of a streamed
+    response) only reach the histograms.
+    """
+
+    def __init__(self, app, metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timings = []
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing(timings, time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        self.metrics.requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            self.metrics.requests_in_flight.dec()
+            # Label by route template so /audio/{filename} stays one series
+            route = scope.get("route")
+            self.metrics.request_seconds.observe(
+                (scope["method"], getattr(route, "path", "unmatched"), str(status)),
+                time.perf_counter() - start
+            )
+
+
+metrics = Metrics()
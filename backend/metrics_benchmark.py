@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import time
+from metrics import Metrics, MetricsMiddleware
+
+
+def stage_cost(metrics, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.stage("asr"):
+            pass
+    return (time.perf_counter() - start) * 1e9 / calls
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def timed_app(scope, receive, send):
+    # A request with a handful of stages, like /process-audio
+    for name in ("upload", "ingest", "vad", "asr", "llm", "tts"):
+        with METRICS.stage(name):
+            pass
+    await plain_app(scope, receive, send)
+
+
+METRICS = Metrics(enabled=True)
+
+
+async def request_cost(app, requests):
+    scope = {"type": "http", "method": "POST", "path": "/process-audio"}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) * 1e6 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of stage timing and the metrics middleware, enabled vs disabled")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"stage(): enabled {stage_cost(Metrics(enabled=True), args.calls):6.0f} ns/call,"
+          f" disabled {stage_cost(Metrics(enabled=False), args.calls):6.0f} ns/call")
+
+    bare = asyncio.run(request_cost(plain_app, args.requests))
+    for enabled in (False, True):
+        METRICS.enabled = enabled
+        cost = asyncio.run(request_cost(MetricsMiddleware(timed_app, METRICS), args.requests))
+        print(f"request with 6 stages, metrics {'on ' if enabled else 'off'}: {cost:6.1f} us"
+              f" ({cost - bare:+.1f} us over an uninstrumented app)")
+    print(f"/metrics render: {len(METRICS.render())} bytes")
+
+
+if __name__ == "__main__":
+    main()
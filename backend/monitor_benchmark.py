@@ -0,0 +1,119 @@
+import argparse
+import time
+import cv2
+import numpy as np
+from detectors import detector_pool
+from detector_benchmark import load_frame
+from expression import classify_expression, detect_expression
+from expression_benchmark import legacy_expression_features
+from tracking import FaceTracker, AdaptiveRate
+
+LEGACY_INTERVAL = 0.5
+
+
+def camera_sequence(face_image, frames, size=(640, 480), face_width=160):
+    """
+    A webcam-like sequence: the face drifts across a static background and
+    leaves the picture for a few frames in the middle.
+    """
+    rng = np.random.default_rng(0)
+    width, height = size
+    background = cv2.GaussianBlur(rng.integers(60, 200, (height, width, 3), dtype=np.uint8), (31, 31), 0)
+    scale = face_width / face_image.shape[1]
+    face = cv2.resize(face_image, None, fx=scale, fy=scale)
+    fh, fw = face.shape[:2]
+
+    sequence = []
+    for i in range(frames):
+        frame = background.copy()
+        if not frames // 2 <= i < frames // 2 + 5:
+            t = i / frames
+            x = int((width - fw) * (0.2 + 0.6 * t))
+            y = int((height - fh) * (0.5 + 0.3 * np.sin(2 * np.pi * t)))
+            frame[y:y+fh, x:x+fw] = face
+        sequence.append(frame)
+    return sequence
+
+
+def legacy_sample(frame):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    faces = detector_pool.get("face").detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+    if len(faces) == 0:
+        return None
+    x, y, w, h = faces[0]
+    classify_expression(legacy_expression_features(gray[y:y+h, x:x+w]))
+    return tuple(int(v) for v in faces[0])
+
+
+def tracked_sample(tracker):
+    def sample(frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        face = tracker.update(gray)
+        if face is not None:
+            x, y, w, h = face
+            detect_expression(gray[y:y+h, x:x+w])
+        return face
+    return sample
+
+
+def run(sample, sequence):
+    timings, boxes = [], []
+    for frame in sequence:
+        start = time.perf_counter()
+        boxes.append(sample(frame))
+        timings.append(time.perf_counter() - start)
+    return np.array(timings), boxes
+
+
+def overlap(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(min(ax + aw, bx + bw) - max(ax, bx), 0)
+    ih = max(min(ay + ah, by + bh) - max(ay, by), 0)
+    inter = iw * ih
+    return inter / (aw * ah + bw * bh - inter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expression monitor cost: full-frame search every sample vs ROI tracking")
+    parser.add_argument("--image", help="photo containing one face to move around the frame")
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+
+    if not args.image:
+        print("No --image given: the synthetic frame has no face, so tracking never engages")
+    sequence = camera_sequence(load_frame(args.image), args.frames)
+    detector_pool.warm_up()
+
+    legacy_times, legacy_boxes = run(legacy_sample, sequence)
+    tracker = FaceTracker()
+    tracked_times, tracked_boxes = run(tracked_sample(tracker), sequence)
+
+    rate = AdaptiveRate()
+    periods = []
+    for seconds in tracked_times:
+        rate.record(seconds)
+        periods.append(rate.period)
+    tracked_period = np.mean(periods)
+
+    legacy_period = legacy_times.mean() + LEGACY_INTERVAL
+    print(f"{args.frames} frames, {tracker.full_searches} full searches, {tracker.roi_searches} ROI searches")
+    print(f"{'':>8} {'mean':>8} {'p95':>8} {'update every':>13} {'CPU of one core':>16}")
+    print(
+        f"{'legacy':>8} {legacy_times.mean() * 1000:6.1f}ms {np.percentile(legacy_times, 95) * 1000:6.1f}ms"
+        f" {legacy_period * 1000:11.0f}ms {legacy_times.mean() / legacy_period:15.0%}"
+    )
+    print(
+        f"{'tracked':>8} {tracked_times.mean() * 1000:6.1f}ms {np.percentile(tracked_times, 95) * 1000:6.1f}ms"
+        f" {tracked_period * 1000:11.0f}ms {tracked_times.mean() / tracked_period:15.0%}"
+    )
+    print(f"full-frame search at the tracked rate would need {legacy_times.mean() / tracked_period:.0%} of a core")
+
+    both = [(a, b) for a, b in zip(legacy_boxes, tracked_boxes) if a and b]
+    missed = sum(1 for a, b in zip(legacy_boxes, tracked_boxes) if a and not b)
+    if both:
+        print(f"box agreement: mean IoU {np.mean([overlap(a, b) for a, b in both]):.2f}, {missed} faces missed by tracking")
+
+
+if __name__ == "__main__":
+    main()
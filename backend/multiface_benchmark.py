@@ -0,0 +1,65 @@
+import argparse
+import time
+import cv2
+import numpy as np
+from detectors import detector_pool
+from detector_benchmark import load_frame
+from expression import analyze_frame
+
+
+def group_frames(face_image, faces, size, count, face_share):
+    """
+    JPEG frames of the given size with `faces` copies of the face side by
+    side, each at face_share of the frame height and under its own lighting.
+    """
+    rng = np.random.default_rng(0)
+    width, height = size
+    background = cv2.GaussianBlur(rng.integers(60, 200, (height, width, 3), dtype=np.uint8), (31, 31), 0)
+    scale = min(face_share * height, 0.9 * width / faces) / face_image.shape[0]
+    face = cv2.resize(face_image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    fh, fw = face.shape[:2]
+    gap = (width - faces * fw) // (faces + 1)
+
+    frames = []
+    for _ in range(count):
+        frame = background.copy()
+        for i in range(faces):
+            x = gap + i * (fw + gap)
+            y = (height - fh) // 2
+            frame[y:y+fh, x:x+fw] = np.clip(face * rng.uniform(0.85, 1.15), 0, 255).astype(np.uint8)
+        frames.append(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return frames
+
+
+def measure(frames, max_faces):
+    start = time.perf_counter()
+    results = [analyze_frame(image_data, max_faces=max_faces) for image_data in frames]
+    return (time.perf_counter() - start) * 1000 / len(frames), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/detect-face cost per frame as the number of analyzed faces grows")
+    parser.add_argument("--image", required=True, help="photo containing one face")
+    parser.add_argument("--faces", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--face-share", type=float, default=0.35)
+    args = parser.parse_args()
+
+    face_image = load_frame(args.image)
+    detector_pool.warm_up()
+
+    print(f"{'faces':>5} {'found':>6} {'one pass':>9} {'separately':>11} {'ratio':>6}")
+    for faces in args.faces:
+        frames = group_frames(face_image, faces, (args.width, args.height), args.frames, args.face_share)
+        shared_ms, results = measure(frames, faces)
+        found = np.mean([len(result["faces"]) for result in results])
+        # Analyzing each face on its own repeats the decode and face search per face
+        single_ms, _ = measure(frames, 1)
+        separate_ms = found * single_ms
+        print(f"{faces:>5} {found:6.1f} {shared_ms:7.1f}ms {separate_ms:9.1f}ms {shared_ms / separate_ms:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
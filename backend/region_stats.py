@@ -0,0 +1,47 @@
+import math
+import cv2
+import numpy as np
+
+# Horizontal bands of the face box, as (top, bottom) fractions of its height,
+# whose mean brightness the expression rules compare.
+MEAN_REGIONS = {
+    "brightness": (0.0, 1.0),
+    "upper_brightness": (0.0, 0.5),
+    "lower_brightness": (0.5, 1.0),
+    "middle_brightness": (0.3, 0.7),
+}
+# Band whose standard deviation is the lower-face contrast.
+CONTRAST_REGION = (0.66, 1.0)
+
+
+def _rows(height, band):
+    top, bottom = band
+    return int(height*top), height if bottom == 1.0 else int(height*bottom)
+
+
+def region_stats(face_gray):
+    """
+    Every brightness statistic of one face from row-wise reductions.
+    The rows are summed once (exact integer sums); each band's mean then
+    comes from the prefix sums of those rows, so overlapping bands cost
+    nothing extra, and the lower band's rows are also summed squared for
+    its standard deviation. Same bands as slicing face_gray and calling
+    np.mean / np.std on each slice, equal to within float rounding.
+    """
+    height, width = face_gray.shape
+    row_sums = cv2.reduce(face_gray, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+    prefix = np.zeros(height + 1, dtype=np.int64)
+    np.cumsum(row_sums, out=prefix[1:])
+
+    stats = {}
+    for name, band in MEAN_REGIONS.items():
+        top, bottom = _rows(height, band)
+        stats[name] = float(prefix[bottom] - prefix[top]) / ((bottom - top) * width)
+
+    # Variance from exact integer sums and sums of squares of the band's rows
+    top, bottom = _rows(height, CONTRAST_REGION)
+    count = (bottom - top) * width
+    total = int(prefix[bottom] - prefix[top])
+    squares = int(cv2.reduce(face_gray[top:bottom], 1, cv2.REDUCE_SUM2, dtype=cv2.CV_64F).sum())
+    stats["lower_contrast"] = math.sqrt((count * squares - total * total) / (count * count))
+    return stats
@@ -0,0 +1,98 @@
+import argparse
+import time
+import numpy as np
+from expression import classify_expression
+from expression_benchmark import collect_frames, collect_faces
+from region_stats import region_stats
+
+
+def legacy_region_stats(face_gray):
+    """
+    The original five slices and numpy reductions, kept as the reference.
+    """
+    height, width = face_gray.shape
+    return {
+        "brightness": np.mean(face_gray),
+        "upper_brightness": np.mean(face_gray[0:int(height*0.5), :]),
+        "lower_brightness": np.mean(face_gray[int(height*0.5):, :]),
+        "middle_brightness": np.mean(face_gray[int(height*0.3):int(height*0.7), :]),
+        "lower_contrast": np.std(face_gray[int(height*0.66):, :]),
+    }
+
+
+def synthetic_faces(count, rng):
+    """
+    Crops of every size the detector can return: noise, flat patches and
+    gradients, including odd heights where the band edges round.
+    """
+    faces = []
+    for i in range(count):
+        height, width = rng.integers(24, 400, size=2)
+        kind = i % 3
+        if kind == 0:
+            face = rng.integers(0, 256, (height, width))
+        elif kind == 1:
+            face = np.full((height, width), rng.integers(0, 256))
+        else:
+            face = np.linspace(rng.integers(0, 128), rng.integers(128, 256), height)[:, None].repeat(width, axis=1)
+        faces.append(face.astype(np.uint8))
+    return faces
+
+
+def decisions(stats):
+    """
+    Every threshold comparison classify_expression makes on these statistics.
+    """
+    b = stats["brightness"]
+    return (
+        b < 75, b < 85, 80 <= b <= 100,
+        stats["upper_brightness"] < stats["lower_brightness"] - 15,
+        stats["upper_brightness"] < stats["middle_brightness"] - 12,
+        stats["lower_contrast"] < 35,
+    )
+
+
+def labels(stats):
+    # Two eyes and no smile: the branch of classify_expression that reads every statistic
+    return classify_expression(dict(stats, num_eyes=2, num_eyes_loose=2, num_smiles_high=0,
+                                     num_smiles_medium=0, num_smiles_low=0))[0]
+
+
+def timed(func, faces, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(faces)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(faces))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equivalence and cost of region_stats against five numpy passes")
+    parser.add_argument("frames", nargs="*", help="Frame images or directories to take real face crops from")
+    parser.add_argument("--synthetic", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    faces = [face for _, face in collect_faces(collect_frames(args.frames))] if args.frames else []
+    faces += synthetic_faces(args.synthetic, np.random.default_rng(0))
+
+    failures = 0
+    worst = {}
+    for face in faces:
+        old, new = legacy_region_stats(face), region_stats(face)
+        for name in old:
+            worst[name] = max(worst.get(name, 0.0), abs(float(old[name]) - new[name]))
+        if decisions(old) != decisions(new) or labels(old) != labels(new):
+            failures += 1
+
+    print(f"{len(faces)} faces ({len(faces) - args.synthetic} from frames)")
+    for name, diff in worst.items():
+        print(f"  {name:>17}: max |difference| {diff:.2e}")
+
+    legacy_us = timed(lambda fs: [legacy_region_stats(f) for f in fs], faces, args.repeat)
+    single_us = timed(lambda fs: [region_stats(f) for f in fs], faces, args.repeat)
+    print(f"five passes {legacy_us:7.1f} us/face, region_stats {single_us:7.1f} us/face")
+    print(f"{failures} faces changed a threshold decision or label (tests/test_region_stats.py enforces none)")
+
+
+if __name__ == "__main__":
+    main()
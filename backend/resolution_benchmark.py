@@ -0,0 +1,104 @@
+import argparse
+import time
+import cv2
+import numpy as np
+from detectors import detector_pool
+from detector_benchmark import load_frame
+from expression import analyze_frame, extract_expression_features, classify_expression
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def legacy_analyze_frame(image_data):
+    """
+    The full-resolution path: color decode, cvtColor, detection at upload size.
+    """
+    frame = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    faces = detector_pool.get("face").detectMultiScale(
+        gray, scaleFactor=1.1, minNeighbors=5, minSize=(50, 50), flags=cv2.CASCADE_SCALE_IMAGE
+    )
+    if len(faces) == 0:
+        return None, None
+    x, y, w, h = (int(v) for v in faces[0])
+    label, _ = classify_expression(extract_expression_features(gray[y:y+h, x:x+w]))
+    return label, (x, y, w, h)
+
+
+def reduced_analyze_frame(image_data):
+    result = analyze_frame(image_data)
+    if not result["face_detected"]:
+        return None, None
+    box = result["face_dimensions"]
+    return result["expression"], (box["x"], box["y"], box["width"], box["height"])
+
+
+def webcam_frames(face_image, size, count, face_share):
+    """
+    JPEG frames of the given size with the face at face_share of the frame
+    height, drifting slightly and under varying light like a live camera.
+    """
+    rng = np.random.default_rng(0)
+    width, height = size
+    background = cv2.GaussianBlur(rng.integers(60, 200, (height, width, 3), dtype=np.uint8), (31, 31), 0)
+    scale = face_share * height / face_image.shape[0]
+    face = cv2.resize(face_image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    fh, fw = face.shape[:2]
+
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        x = (width - fw) // 2 + int(0.05 * width * np.sin(i / 4))
+        y = (height - fh) // 2
+        frame[y:y+fh, x:x+fw] = np.clip(face * rng.uniform(0.85, 1.15), 0, 255).astype(np.uint8)
+        frames.append(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return frames
+
+
+def measure(analyze, frames):
+    timings, results = [], []
+    for image_data in frames:
+        start = time.perf_counter()
+        results.append(analyze(image_data))
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings), results
+
+
+def overlap(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(min(ax + aw, bx + bw) - max(ax, bx), 0)
+    ih = max(min(ay + ah, by + bh) - max(ay, by), 0)
+    inter = iw * ih
+    return inter / (aw * ah + bw * bh - inter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/detect-face cost at 480p/720p/1080p: full-size vs reduced decoding")
+    parser.add_argument("--image", help="photo containing one face")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--face-share", type=float, default=0.4, help="face height as a share of frame height")
+    args = parser.parse_args()
+
+    if not args.image:
+        print("No --image given: the synthetic frame has no face, so only decode and search cost is compared")
+    face_image = load_frame(args.image)
+    detector_pool.warm_up()
+
+    print(f"{'':>6} {'full-size':>10} {'reduced':>9} {'speedup':>8} {'labels':>7} {'box IoU':>8}")
+    for name, size in RESOLUTIONS.items():
+        frames = webcam_frames(face_image, size, args.frames, args.face_share)
+        legacy_times, legacy = measure(legacy_analyze_frame, frames)
+        reduced_times, reduced = measure(reduced_analyze_frame, frames)
+
+        agree = sum(1 for (a, _), (b, _) in zip(legacy, reduced) if a == b)
+        boxes = [overlap(a, b) for (_, a), (_, b) in zip(legacy, reduced) if a and b]
+        iou = f"{np.mean(boxes):.2f}" if boxes else "-"
+        print(
+            f"{name:>6} {legacy_times.mean():8.1f}ms {reduced_times.mean():7.1f}ms"
+            f" {legacy_times.mean() / reduced_times.mean():7.1f}x {agree:>3}/{len(frames):<3} {iou:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
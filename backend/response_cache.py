@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, namedtuple
+
+CachedResponse = namedtuple("CachedResponse", ["text", "audio_filenames"])
+
+# Zero-width joiners and the like change how a word renders, not what it says
+INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+# Chandrabindu and anusvara are used interchangeably in transcripts
+SPELLING = {ord("\u0901"): "\u0902"}
+
+
+def normalize_transcript(text):
+    """
+    Canonical form of a Hindi transcript for cache lookups: NFC, no
+    punctuation (danda included) or invisible characters, chandrabindu
+    folded into anusvara, case-folded Latin, single spaces.
+    """
+    text = unicodedata.normalize("NFC", text).translate(INVISIBLE).translate(SPELLING).casefold()
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return " ".join(text.split())
+
+
+class ResponseCache:
+    """
+    Finished replies (text and synthesized audio) for repeated utterances.
+    Entries are keyed on the normalized transcript, the expression context
+    given to the LLM and a fingerprint of the last history_messages of the
+    conversation, so a greeting at the start of any session is answered
+    from the cache while the same words mid-conversation still reach the
+    LLM. Bounded by max_entries (least recently used evicted first) and ttl.
+    Off unless RESPONSE_CACHE_ENABLED=1.
+    """
+
+    def __init__(self, enabled=None, max_entries=None, ttl=None, history_messages=None):
+        self.enabled = enabled if enabled is not None else os.getenv("RESPONSE_CACHE_ENABLED", "0") != "0"
+        self.max_entries = max_entries or int(os.getenv("RESPONSE_CACHE_SIZE", 1000))
+        self.ttl = ttl or float(os.getenv("RESPONSE_CACHE_TTL", 3600))
+        self.history_messages = (
+            history_messages if history_messages is not None
+            else int(os.getenv("RESPONSE_CACHE_HISTORY", 2))
+        )
+
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, transcript, context, history):
+        """
+        Cache key of a turn, from the history before the user's message.
+        None when the cache is disabled.
+        """
+        if not self.enabled:
+            return None
+        recent = history[-self.history_messages:] if self.history_messages else []
+        fingerprint = [
+            normalize_transcript(transcript),
+            context,
+            [(message["role"], normalize_transcript(message["content"])) for message in recent],
+        ]
+        return hashlib.sha256(json.dumps(fingerprint, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key, text, audio_filenames):
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), CachedResponse(text, list(audio_filenames)))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"enabled": self.enabled, "entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+response_cache = ResponseCache()
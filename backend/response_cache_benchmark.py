@@ -0,0 +1,102 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+
+# Local stand-ins for every hosted service, set before the app is imported
+AUDIO_DIR = tempfile.TemporaryDirectory(prefix="response-cache-audio-")
+os.environ.update(
+    ASR_ENGINE="stub",
+    ASR_BATCH_SIZE="1",
+    TTS_ENGINE="stub",
+    LLM_ENGINE="stub",
+    # One-off replies share no text, so only the response cache can skip TTS
+    STUB_LLM_UNIQUE_REPLIES="1",
+    AUDIO_CACHE_DIR=AUDIO_DIR.name,
+)
+
+from fastapi.testclient import TestClient
+import api
+import graph
+from response_cache import response_cache
+from voice_load_test import speech_wav
+
+# Stock phrases users open with, as ASR returns them, most common first
+STOCK_PHRASES = [
+    ["नमस्ते", "नमस्ते।", "नमस्ते!"],
+    ["तुम कौन हो?", "तुम कौन हो"],
+    ["आप कैसे हैं?", "आप कैसे हैं"],
+    ["धन्यवाद", "धन्यवाद।"],
+    ["हाँ", "हां"],
+]
+
+
+def traffic(turns, unique_share, rng):
+    """
+    First utterances of new sessions: stock phrases in varying spellings
+    with Zipf-like popularity, mixed with one-off questions.
+    """
+    weights = [1 / (rank + 1) for rank in range(len(STOCK_PHRASES))]
+    utterances = []
+    for i in range(turns):
+        if rng.random() < unique_share:
+            utterances.append(f"मुझे सवाल नंबर {i} के बारे में बताइए")
+        else:
+            utterances.append(rng.choice(rng.choices(STOCK_PHRASES, weights)[0]))
+    return utterances
+
+
+def run(client, utterances, audio, enabled, tag):
+    """
+    Latency (ms) of every turn and whether it was answered from the cache.
+    """
+    response_cache.enabled = enabled
+    latencies, hits = [], []
+    for i, utterance in enumerate(utterances):
+        api.asr_engine.transcript = utterance
+        hits_before = response_cache.stats()["hits"]
+        start = time.perf_counter()
+        response = client.post("/process-audio", files={"audio": ("turn.wav", audio, "audio/wav")},
+                               data={"session_id": f"{tag}-{i}"})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits.append(response_cache.stats()["hits"] > hits_before)
+    return np.array(latencies), np.array(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn latency for repeated utterances with and without the response cache")
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--unique-share", type=float, default=0.3, help="share of one-off questions")
+    parser.add_argument("--llm-latency", default="lognormal:0.5,0.3")
+    parser.add_argument("--tts-latency", default="lognormal:0.25,0.3")
+    args = parser.parse_args()
+
+    # Rebuild the stand-ins with this run's latencies
+    os.environ.update(STUB_LLM_LATENCY=args.llm_latency, STUB_TTS_LATENCY=args.tts_latency)
+    graph.llm = None
+    api.tts_engine = api.get_tts_engine()
+    utterances = traffic(args.turns, args.unique_share, random.Random(0))
+    audio = speech_wav()
+
+    try:
+        with TestClient(api.app) as client:
+            off, _ = run(client, utterances, audio, False, "off")
+            on, hits = run(client, utterances, audio, True, "on")
+            entries = response_cache.stats()["entries"]
+    finally:
+        AUDIO_DIR.cleanup()
+
+    print(f"{args.turns} first turns, {args.unique_share:.0%} one-off questions")
+    print(f"cache off: mean {off.mean():7.1f} ms, p50 {np.percentile(off, 50):7.1f} ms")
+    print(f"cache on:  mean {on.mean():7.1f} ms, p50 {np.percentile(on, 50):7.1f} ms,"
+          f" {hits.sum()}/{args.turns} hits ({entries} entries)")
+    if hits.any():
+        print(f"hits:      p50 {np.percentile(on[hits], 50):7.1f} ms, max {on[hits].max():7.1f} ms;"
+              f" misses p50 {np.percentile(on[~hits], 50):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_SESSION = "default"
+
+
+def estimate_tokens(text):
+    """
+    Rough token count for budget checks; about 4 characters per token.
+    """
+    return len(text) // 4 + 1
+
+
+class Session:
+    def __init__(self):
+        self.messages = []
+        self.summary = ""
+        self.tokens = 0
+        self.size_bytes = 0
+        self.last_active = time.monotonic()
+
+
+class ConversationStore:
+    """
+    Conversation history keyed by session id.
+    Each session keeps a sliding window of at most max_turns user/assistant
+    turns and max_tokens estimated tokens. Sessions idle for longer than
+    idle_timeout seconds are dropped, and the least recently used sessions are
+    evicted when there are more than max_sessions or the stored text exceeds
+    max_bytes.
+    """
+
+    def __init__(self, max_turns=None, max_tokens=None, max_sessions=None,
+                 idle_timeout=None, max_bytes=None):
+        self.max_turns = max_turns or int(os.getenv("SESSION_MAX_TURNS", 20))
+        self.max_tokens = max_tokens or int(os.getenv("SESSION_MAX_TOKENS", 4000))
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_SESSIONS", 1000))
+        self.idle_timeout = idle_timeout or float(os.getenv("SESSION_IDLE_TIMEOUT", 30 * 60))
+        self.max_bytes = max_bytes or int(os.getenv("SESSION_MAX_BYTES", 50 * 1024 * 1024))
+
+        self._sessions = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def history(self, session_id):
+        """
+        Return a copy of the session's windowed history.
+        """
+        with self._lock:
+            session = self._touch(session_id)
+            return list(session.messages)
+
+    def append(self, session_id, role, content):
+        with self._lock:
+            session = self._touch(session_id)
+            message = {"role": role, "content": content}
+            session.messages.append(message)
+            self._account(session, message, 1)
+            self._trim(session)
+            self._evict()
+
+    def summary(self, session_id):
+        with self._lock:
+            return self._touch(session_id).summary
+
+    def fold(self, session_id, messages, summary):
+        """
+        Replace the given messages, as returned by history(), with an updated
+        summary. Only those exact messages are removed, so turns appended (or
+        trimmed away) while the summary was being written are left alone.
+        A summary of a session that was reset meanwhile is dropped.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            folded = {id(message) for message in messages}
+            if session is None or not any(id(message) in folded for message in session.messages):
+                return
+            kept = []
+            for message in session.messages:
+                if id(message) in folded:
+                    self._account(session, message, -1)
+                else:
+                    kept.append(message)
+            session.messages = kept
+            size_change = len(summary.encode("utf-8")) - len(session.summary.encode("utf-8"))
+            session.summary = summary
+            session.size_bytes += size_change
+            self._size_bytes += size_change
+
+    def reset(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._size_bytes -= session.size_bytes
+
+    def stats(self):
+        with self._lock:
+            self._evict()
+            return {
+                "active": len(self._sessions),
+                "size_bytes": self._size_bytes,
+                # Totals only: a session id is enough to read its conversation
+                "messages": sum(len(session.messages) for session in self._sessions.values()),
+            }
+
+    def _touch(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = Session()
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_active = time.monotonic()
+        return session
+
+    def _account(self, session, message, sign):
+        size = len(message["content"].encode("utf-8"))
+        session.tokens += sign * estimate_tokens(message["content"])
+        session.size_bytes += sign * size
+        self._size_bytes += sign * size
+
+    def _trim(self, session):
+        # Drop the oldest messages, but always keep the newest one
+        while len(session.messages) > 1 and (
+            len(session.messages) > self.max_turns * 2 or session.tokens > self.max_tokens
+        ):
+            self._account(session, session.messages.pop(0), -1)
+        # Keep the window starting on a user turn
+        while len(session.messages) > 1 and session.messages[0]["role"] != "user":
+            self._account(session, session.messages.pop(0), -1)
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            idle = now - session.last_active > self.idle_timeout
+            over_capacity = (
+                len(self._sessions) > self.max_sessions or self._size_bytes > self.max_bytes
+            )
+            if not (idle or over_capacity):
+                break
+            del self._sessions[session_id]
+            self._size_bytes -= session.size_bytes
+
+
+conversations = ConversationStore()
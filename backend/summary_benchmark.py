@@ -0,0 +1,66 @@
+import argparse
+import time
+import numpy as np
+import graph as graph_module
+from fakes import FakeChatModel
+
+USER_TURN = "मुझे अपने दिन के बारे में बताना है। आज मैंने बाज़ार से सब्ज़ियाँ खरीदीं और फिर दोस्तों से मिली। "
+
+
+def run_session(args, summarize):
+    """
+    Drive one long session the way /process-audio does and return the
+    chatbot latency and prompt size of every turn. Summaries are written
+    after each reply, outside the timed turn, as the API does in the
+    background.
+    """
+    graph_module.SUMMARY_TRIGGER_TOKENS = args.trigger_tokens if summarize else 10**9
+    llm = graph_module.llm = FakeChatModel(
+        response="ठीक है, यह सुनकर अच्छा लगा। " * 4,
+        base_latency=args.base_latency,
+        per_token_latency=args.per_token_latency
+    )
+
+    history, summary = [], ""
+    latencies, prompt_sizes = [], []
+    for turn in range(args.turns):
+        history.append({"role": "user", "content": f"{turn}: {USER_TURN * 3}"})
+        calls_before = len(llm.prompt_tokens)
+
+        start = time.perf_counter()
+        response_text = None
+        for kind, value in graph_module.stream_response(history, summary):
+            if kind == "final":
+                response_text = value
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        # Same bookkeeping as the API's summarize_session + ConversationStore.fold
+        history.append({"role": "assistant", "content": response_text})
+        prompt_sizes.append(llm.prompt_tokens[calls_before])
+        result = graph_module.summarize_history(history, summary)
+        if result is not None:
+            summary, folded = result
+            del history[:folded]
+
+    return np.array(latencies), np.array(prompt_sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn chatbot latency with and without rolling summarization")
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--trigger-tokens", type=int, default=graph_module.SUMMARY_TRIGGER_TOKENS)
+    parser.add_argument("--base-latency", type=float, default=0.02, help="Fake model fixed latency (s)")
+    parser.add_argument("--per-token-latency", type=float, default=0.00005, help="Fake model prefill cost per token (s)")
+    args = parser.parse_args()
+
+    print(f"{args.turns} turns, summary trigger {args.trigger_tokens} tokens")
+    for label, summarize in (("full history", False), ("rolling summary", True)):
+        latencies, prompt_sizes = run_session(args, summarize)
+        quarter = max(len(latencies) // 4, 1)
+        print(f"{label:>16}: first-quarter {latencies[:quarter].mean():7.1f} ms  "
+              f"last-quarter {latencies[-quarter:].mean():7.1f} ms  "
+              f"final prompt {prompt_sizes[-1]:6d} tokens")
+
+
+if __name__ == "__main__":
+    main()
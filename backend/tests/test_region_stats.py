@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from region_stats import region_stats
+from region_stats_benchmark import legacy_region_stats, synthetic_faces, decisions, labels
+
+FACES = synthetic_faces(300, np.random.default_rng(0))
+
+
+@pytest.mark.parametrize("face", FACES, ids=lambda face: "x".join(map(str, face.shape)))
+def test_matches_numpy_reductions(face):
+    expected, stats = legacy_region_stats(face), region_stats(face)
+    assert stats.keys() == expected.keys()
+    for name, value in expected.items():
+        assert stats[name] == pytest.approx(float(value), rel=1e-12, abs=1e-9), name
+    assert decisions(stats) == decisions(expected)
+    assert labels(stats) == labels(expected)
+
+
+def test_means_are_exact():
+    # Band means come from exact integer sums, so they match np.mean bit for bit
+    for face in FACES:
+        expected, stats = legacy_region_stats(face), region_stats(face)
+        for name in ("brightness", "upper_brightness", "lower_brightness", "middle_brightness"):
+            assert stats[name] == float(expected[name])
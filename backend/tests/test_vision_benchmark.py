@@ -0,0 +1,31 @@
+import json
+import os
+import shutil
+from vision_benchmark import compare, load_frames, replay
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_replay_matches_golden(monkeypatch):
+    # Golden names are relative to backend/, where CI runs the benchmark
+    monkeypatch.chdir(BACKEND)
+    with open("tests/golden.json", encoding="utf-8") as f:
+        golden = json.load(f)
+
+    labels, _, _ = replay(load_frames(["tests/frames"]), smooth=True)
+
+    agree, compared, mismatches = compare(labels, golden)
+    assert mismatches == []
+    assert agree == compared == len(golden)
+
+
+def test_same_file_name_in_two_directories(tmp_path, monkeypatch):
+    frame = os.path.join(BACKEND, "tests", "frames", "teapot.jpg")
+    for directory in ("monday", "tuesday"):
+        (tmp_path / directory).mkdir()
+        shutil.copy(frame, tmp_path / directory / "frame.jpg")
+    monkeypatch.chdir(tmp_path)
+
+    names = [name for name, _ in load_frames(["monday", "tuesday"])]
+
+    assert names == ["monday/frame.jpg", "tuesday/frame.jpg"]
@@ -0,0 +1,102 @@
+import os
+import time
+from detectors import detector_pool
+
+
+class FaceTracker:
+    """
+    Follows one face across consecutive camera frames.
+    Once a face is found, the next frames are searched only inside the last
+    box padded by `padding` of its size, at scales close to the last one.
+    A full-frame search runs every `full_search_every` frames (to pick up a
+    new or moved face) and immediately whenever the face is lost.
+    """
+
+    def __init__(self, padding=None, full_search_every=None, min_size=(30, 30), pool=detector_pool):
+        self.padding = padding or float(os.getenv("TRACK_PADDING", 0.5))
+        self.full_search_every = full_search_every or int(os.getenv("TRACK_FULL_SEARCH_EVERY", 15))
+        self.min_size = min_size
+        self.pool = pool
+
+        self.box = None
+        self.full_searches = 0
+        self.roi_searches = 0
+        self._since_full = 0
+
+    def update(self, gray):
+        """
+        Locate the face in a grayscale frame; returns (x, y, w, h) or None.
+        """
+        box = None
+        if self.box is not None and self._since_full < self.full_search_every:
+            box = self._search_roi(gray)
+        if box is None:
+            box = self._search_full(gray)
+        self.box = box
+        return box
+
+    def reset(self):
+        self.box = None
+
+    def _search_full(self, gray):
+        self.full_searches += 1
+        self._since_full = 0
+        faces = self.pool.get("face").detectMultiScale(
+            gray, scaleFactor=1.1, minNeighbors=5, minSize=self.min_size
+        )
+        if len(faces) == 0:
+            return None
+        # The largest face is the user sitting closest to the camera
+        return tuple(int(v) for v in max(faces, key=lambda f: f[2] * f[3]))
+
+    def _search_roi(self, gray):
+        self.roi_searches += 1
+        self._since_full += 1
+        x, y, w, h = self.box
+        pad_x, pad_y = int(w * self.padding), int(h * self.padding)
+        x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+        x1, y1 = min(x + w + pad_x, gray.shape[1]), min(y + h + pad_y, gray.shape[0])
+
+        # The face cannot change size much between samples
+        min_side = max(int(w * 0.7), self.min_size[0])
+        max_side = int(w * 1.4)
+        faces = self.pool.get("face").detectMultiScale(
+            gray[y0:y1, x0:x1], scaleFactor=1.1, minNeighbors=5,
+            minSize=(min_side, min_side), maxSize=(max_side, max_side)
+        )
+        if len(faces) == 0:
+            return None
+        fx, fy, fw, fh = max(faces, key=lambda f: f[2] * f[3])
+        return int(fx) + x0, int(fy) + y0, int(fw), int(fh)
+
+
+class AdaptiveRate:
+    """
+    Paces a sampling loop so its processing stays within a CPU budget.
+    After each sample the next one is scheduled far enough out that
+    processing time / period ≈ cpu_budget, clamped between min_fps and
+    max_fps. Cheap tracked frames therefore sample quickly, expensive
+    full searches back the rate off.
+    """
+
+    def __init__(self, cpu_budget=None, min_fps=None, max_fps=None):
+        self.cpu_budget = cpu_budget or float(os.getenv("MONITOR_CPU_BUDGET", 0.25))
+        self.min_fps = min_fps or float(os.getenv("MONITOR_MIN_FPS", 2))
+        self.max_fps = max_fps or float(os.getenv("MONITOR_MAX_FPS", 15))
+
+        self.period = 1 / self.max_fps
+        self._average = None
+        self._next = 0.0
+
+    def due(self):
+        return time.monotonic() >= self._next
+
+    def record(self, seconds):
+        """
+        Record how long one sample took and schedule the next one.
+        """
+        # Smooth over a few samples so one full search does not stall the loop
+        self._average = seconds if self._average is None else 0.7 * self._average + 0.3 * seconds
+        period = self._average / self.cpu_budget
+        self.period = min(max(period, 1 / self.max_fps), 1 / self.min_fps)
+        self._next = time.monotonic() + self.period - seconds
@@ -0,0 +1,131 @@
+import asyncio
+import io
+import os
+import re
+from gtts import gTTS
+
+# Hindi sentence ends (danda, double danda, ?, !) split immediately; a period
+# only counts when followed by whitespace so numbers like 3.5 stay intact.
+SENTENCE_END = re.compile(r"[।॥?!]+|\.(?=\s)")
+
+
+def split_sentences(text):
+    """
+    Split a response into sentences for chunked synthesis.
+    """
+    chunker = SentenceChunker()
+    sentences = chunker.feed(text)
+    rest = chunker.flush()
+    return sentences + ([rest] if rest else [])
+
+
+class SentenceChunker:
+    """
+    Incrementally cut streamed LLM tokens into complete sentences.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text):
+        """
+        Add streamed text and return every sentence it completed.
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        """
+        Return whatever text is left once the stream has ended.
+        """
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest
+
+
+class GTTSEngine:
+    """
+    Google Text-to-Speech; returns MP3 bytes.
+    """
+
+    name = "gtts"
+
+    def __init__(self, lang="hi", slow=False):
+        self.lang = lang
+        self.slow = slow
+
+    def synthesize(self, text):
+        audio = io.BytesIO()
+        gTTS(text=text, lang=self.lang, slow=self.slow).write_to_fp(audio)
+        return audio.getvalue()
+
+
+def get_tts_engine(name=None):
+    """
+    Build the engine selected by TTS_ENGINE ("gtts" or "stub").
+    """
+    name = name or os.getenv("TTS_ENGINE", "gtts")
+    if name == "gtts":
+        return GTTSEngine()
+    if name == "stub":
+        from fakes import StubTTSEngine
+        return StubTTSEngine(
+            latency=os.getenv("STUB_TTS_LATENCY", "0"),
+            per_char_latency=float(os.getenv("STUB_TTS_PER_CHAR_LATENCY", 0))
+        )
+    raise ValueError(f"Unknown TTS_ENGINE '{name}'")
+
+
+class TTSPipeline:
+    """
+    Synthesizes sentences concurrently and releases the results in order.
+    synthesize(text) runs on the stage executor's I/O pool, so sentences are
+    produced while the LLM is still generating the rest of the response.
+    """
+
+    def __init__(self, synthesize, executor):
+        self._synthesize = synthesize
+        self._executor = executor
+        self._tasks = []
+        self._next = 0
+
+    def submit(self, text):
+        self._tasks.append(asyncio.ensure_future(self._executor.run_io(self._synthesize, text)))
+
+    def ready(self):
+        """
+        Return the results that are finished and next in order, without waiting.
+        """
+        results = []
+        while self._next < len(self._tasks) and self._tasks[self._next].done():
+            results.append(self._take())
+        return results
+
+    async def remaining(self):
+        """
+        Wait for and yield every result not yet released, in order.
+        """
+        while self._next < len(self._tasks):
+            await self._tasks[self._next]
+            yield self._take()
+
+    def cancel(self):
+        """
+        Stop the sentences not yet released; failures among them are dropped.
+        """
+        for task in self._tasks[self._next:]:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
+
+    def _take(self):
+        index = self._next
+        self._next += 1
+        return index, self._tasks[index].result()
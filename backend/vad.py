@@ -0,0 +1,97 @@
+import os
+import numpy as np
+import speech_recognition as sr
+from asr import SAMPLE_RATE, SAMPLE_WIDTH, to_pcm
+
+
+class VoiceActivityDetector:
+    """
+    Energy-based voice activity detection on 16 kHz mono PCM.
+    Each frame's level (dBFS) is compared against a threshold derived from
+    the capture itself: the noise floor (a low percentile of frame levels)
+    plus margin_db, capped below the loudest frame so a capture with few
+    pauses still counts as speech, and never below min_level_db so
+    near-silence is never speech. A capture whose level neither rises
+    margin_db above the floor nor varies by steady_db (standard deviation
+    of frame levels) is steady noise, such as a fan, not speech; speech
+    with few pauses still varies from syllable to syllable. Speech frames
+    separated by less than split_silence_ms belong to one utterance;
+    utterances shorter than min_speech_ms are dropped as clicks, and the
+    rest keep padding_ms of context on each side so word onsets survive
+    trimming.
+    """
+
+    def __init__(self, frame_ms=None, margin_db=None, min_level_db=None,
+                 min_speech_ms=None, padding_ms=None, split_silence_ms=None, steady_db=None):
+        self.frame_ms = frame_ms or int(os.getenv("VAD_FRAME_MS", 30))
+        self.margin_db = margin_db or float(os.getenv("VAD_MARGIN_DB", 12))
+        self.min_level_db = min_level_db or float(os.getenv("VAD_MIN_LEVEL_DB", -45))
+        self.min_speech_ms = min_speech_ms or int(os.getenv("VAD_MIN_SPEECH_MS", 150))
+        self.padding_ms = padding_ms or int(os.getenv("VAD_PADDING_MS", 200))
+        self.split_silence_ms = split_silence_ms or int(os.getenv("VAD_SPLIT_SILENCE_MS", 700))
+        self.steady_db = steady_db or float(os.getenv("VAD_STEADY_DB", 2))
+        self.enabled = os.getenv("VAD_ENABLED", "1") != "0"
+
+        self.frame_samples = SAMPLE_RATE * self.frame_ms // 1000
+
+    def frame_levels(self, pcm):
+        """
+        Level of every complete frame in dB relative to full scale.
+        """
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        usable = len(samples) - len(samples) % self.frame_samples
+        frames = samples[:usable].reshape(-1, self.frame_samples).astype(np.float32)
+        power = np.mean(frames * frames, axis=1) / (32768.0 * 32768.0)
+        return 10 * np.log10(power + 1e-10)
+
+    def segments(self, pcm):
+        """
+        (start, end) sample offsets of each utterance in the PCM.
+        """
+        levels = self.frame_levels(pcm)
+        if len(levels) == 0:
+            return []
+
+        floor = np.percentile(levels, 10)
+        if levels.max() - floor < self.margin_db and levels.std() < self.steady_db:
+            return []
+        threshold = max(min(floor + self.margin_db, levels.max() - self.margin_db), self.min_level_db)
+        speech = np.flatnonzero(levels > threshold)
+        if len(speech) == 0:
+            return []
+
+        split_frames = self.split_silence_ms // self.frame_ms
+        min_frames = max(self.min_speech_ms // self.frame_ms, 1)
+        padding = SAMPLE_RATE * self.padding_ms // 1000
+        total = len(pcm) // SAMPLE_WIDTH
+
+        # Runs of speech frames, merged across pauses shorter than split_silence_ms
+        breaks = np.flatnonzero(np.diff(speech) > split_frames)
+        starts = np.concatenate(([speech[0]], speech[breaks + 1]))
+        ends = np.concatenate((speech[breaks], [speech[-1]])) + 1
+
+        segments = []
+        for start, end in zip(starts, ends):
+            if end - start < min_frames:
+                continue
+            segments.append((
+                max(int(start) * self.frame_samples - padding, 0),
+                min(int(end) * self.frame_samples + padding, total)
+            ))
+        return segments
+
+    def split(self, audio_data):
+        """
+        The utterances in AudioData as 16 kHz AudioData, silence removed.
+        Empty when the capture holds no speech; the whole capture when VAD is disabled.
+        """
+        if not self.enabled:
+            return [audio_data]
+        pcm = to_pcm(audio_data)
+        return [
+            sr.AudioData(pcm[start * SAMPLE_WIDTH:end * SAMPLE_WIDTH], SAMPLE_RATE, SAMPLE_WIDTH)
+            for start, end in self.segments(pcm)
+        ]
+
+
+vad = VoiceActivityDetector()
@@ -0,0 +1,76 @@
+import argparse
+import time
+import numpy as np
+import speech_recognition as sr
+from asr import SAMPLE_RATE, audio_seconds, transcribe_utterances
+from audio_ingest_benchmark import synthetic_utterance
+from fakes import StubASREngine
+from vad import vad
+
+
+def capture(speech_seconds, lead, gap, trail, rng):
+    """
+    A microphone-style capture: background noise around one or more utterances.
+    """
+    def noise(seconds):
+        return rng.normal(0, 60, int(seconds * SAMPLE_RATE))
+
+    parts = [noise(lead)]
+    for i, seconds in enumerate(speech_seconds):
+        if i:
+            parts.append(noise(gap))
+        parts.append(synthetic_utterance(seconds, SAMPLE_RATE) + noise(seconds))
+    parts.append(noise(trail))
+    samples = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    return sr.AudioData(samples.tobytes(), SAMPLE_RATE, 2)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def recognize(engine, audio_data, use_vad):
+    """
+    Milliseconds to a transcript (or rejection) with and without the VAD stage.
+    """
+    start = time.perf_counter()
+    utterances = vad.split(audio_data) if use_vad else [audio_data]
+    try:
+        if not utterances:
+            raise sr.UnknownValueError()
+        transcribe_utterances(engine, utterances)
+    except sr.UnknownValueError:
+        pass
+    return (time.perf_counter() - start) * 1000, sum(audio_seconds(u) for u in utterances)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio sent to ASR and time to transcript, with and without VAD")
+    parser.add_argument("--asr-latency", type=float, default=0.3, help="fixed seconds per ASR call")
+    parser.add_argument("--asr-rtf", type=float, default=0.1, help="ASR seconds per audio second")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    engine = StubASREngine(latency=args.asr_latency, rtf=args.asr_rtf)
+    captures = {
+        "short reply": capture([1.5], lead=1.0, gap=0, trail=1.0, rng=rng),
+        "long question": capture([4.0], lead=0.8, gap=0, trail=1.2, rng=rng),
+        "two sentences": capture([2.0, 2.5], lead=1.0, gap=1.2, trail=1.0, rng=rng),
+        "silence only": capture([], lead=4.0, gap=0, trail=0, rng=rng),
+    }
+
+    print(f"{'capture':>14} {'audio':>6} {'to ASR':>7} {'segments':>8} {'VAD':>8} {'no VAD':>9} {'with VAD':>9}")
+    for label, audio_data in captures.items():
+        segments, vad_ms = timed(vad.segments, audio_data.frame_data)
+        without, _ = recognize(engine, audio_data, use_vad=False)
+        with_vad, sent = recognize(engine, audio_data, use_vad=True)
+        print(
+            f"{label:>14} {audio_seconds(audio_data):5.1f}s {sent:6.1f}s {len(segments):>8}"
+            f" {vad_ms:6.2f}ms {without:7.0f}ms {with_vad:7.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
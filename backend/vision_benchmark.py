@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import cv2
+import numpy as np
+from detectors import detector_pool
+from expression import analyze_frame
+from expression_benchmark import collect_frames
+from expression_state import ExpressionStateStore
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+STAGES = ("decode", "detect", "expression", "smoothing", "total")
+PERCENTILES = (50, 90, 99)
+
+
+def frame_name(path):
+    # Relative path, so same-named frames in different directories stay apart
+    return os.path.relpath(path).replace(os.sep, "/")
+
+
+def load_frames(paths):
+    """
+    (name, encoded image) for every frame of the given images, directories
+    of images and videos. Frames are named by their path relative to the
+    working directory; video frames are JPEG-encoded like the browser's
+    camera uploads and named "<video>#<index>".
+    """
+    frames = []
+    for path in paths:
+        if path.lower().endswith(VIDEO_EXTENSIONS):
+            cap = cv2.VideoCapture(path)
+            index = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+                frames.append((f"{frame_name(path)}#{index}", encoded))
+                index += 1
+            cap.release()
+            continue
+        for file in collect_frames([path]):
+            with open(file, "rb") as f:
+                frames.append((frame_name(file), f.read()))
+    return frames
+
+
+def replay(frames, smooth):
+    """
+    Run every frame through /detect-face's code path in order and return
+    the per-frame labels, per-stage timings (seconds) and wall time.
+    """
+    store = ExpressionStateStore() if smooth else None
+    labels = {}
+    timings = {stage: [] for stage in STAGES}
+
+    wall = time.perf_counter()
+    for name, image_data in frames:
+        stage_times = {}
+        start = time.perf_counter()
+        result = analyze_frame(image_data, timings=stage_times)
+        if store is not None:
+            smoothing = time.perf_counter()
+            store.observe("benchmark", result)
+            stage_times["smoothing"] = time.perf_counter() - smoothing
+        stage_times["total"] = time.perf_counter() - start
+
+        if "error" in result:
+            print(f"{name}: {result['error']}")
+        labels[name] = result["expression"] if result["face_detected"] else None
+        for stage, seconds in stage_times.items():
+            timings[stage].append(seconds)
+    return labels, timings, time.perf_counter() - wall
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def compare(labels, golden):
+    """
+    (agreeing frames, compared frames, list of (name, expected, got)).
+    Frames missing from either side are not compared.
+    """
+    names = [name for name in labels if name in golden]
+    mismatches = [(name, golden[name], labels[name]) for name in names if golden[name] != labels[name]]
+    return len(names) - len(mismatches), len(names), mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded frames through the /detect-face path headlessly: "
+                    "throughput, stage latency, peak memory and golden-label agreement"
+    )
+    parser.add_argument("frames", nargs="+", help="Frame images, directories of frames or video files")
+    parser.add_argument("--golden", help="JSON file of expected labels per frame to check against")
+    parser.add_argument("--write-golden", help="Write this run's labels to a JSON golden file")
+    parser.add_argument("--min-agreement", type=float, default=1.0, help="share of golden labels that must match")
+    parser.add_argument("--max-p90-ms", type=float, help="fail if the p90 per-frame latency exceeds this")
+    parser.add_argument("--warmup", type=int, default=3, help="frames analyzed before timing starts")
+    parser.add_argument("--no-smoothing", action="store_true", help="skip the per-session voting stage")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        raise SystemExit("No frames found")
+
+    detector_pool.warm_up()
+    for _, image_data in frames[:args.warmup]:
+        analyze_frame(image_data)
+
+    labels, timings, wall = replay(frames, smooth=not args.no_smoothing)
+
+    faces = sum(1 for label in labels.values() if label is not None)
+    print(f"{len(frames)} frames ({faces} with a face) in {wall:.2f}s: {len(frames) / wall:.1f} frames/s")
+    print(f"{'stage':>10} " + " ".join(f"{f'p{p}':>8}" for p in PERCENTILES) + f" {'max':>8}")
+    for stage in STAGES:
+        samples = np.array(timings[stage]) * 1000
+        if len(samples) == 0:
+            continue
+        values = [np.percentile(samples, p) for p in PERCENTILES] + [samples.max()]
+        print(f"{stage:>10} " + " ".join(f"{v:6.1f}ms" for v in values))
+    print(f"peak RSS: {peak_rss_mb():.0f} MB")
+
+    failed = False
+    if args.write_golden:
+        with open(args.write_golden, "w", encoding="utf-8") as f:
+            json.dump(labels, f, ensure_ascii=False, indent=1)
+        print(f"wrote {len(labels)} labels to {args.write_golden}")
+
+    if args.golden:
+        with open(args.golden, encoding="utf-8") as f:
+            golden = json.load(f)
+        agree, compared, mismatches = compare(labels, golden)
+        share = agree / compared if compared else 0.0
+        print(f"golden labels: {agree}/{compared} agree ({share:.1%})")
+        for name, expected, got in mismatches[:10]:
+            print(f"  {name}: expected {expected}, got {got}")
+        if share < args.min_agreement:
+            print(f"FAIL: agreement below {args.min_agreement:.1%}")
+            failed = True
+
+    if args.max_p90_ms is not None:
+        p90 = np.percentile(np.array(timings["total"]) * 1000, 90)
+        if p90 > args.max_p90_ms:
+            print(f"FAIL: p90 {p90:.1f}ms exceeds {args.max_p90_ms:.1f}ms")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+import httpx
+import numpy as np
+from health_load_test import wait_for_server
+
+STAGES = ("upload", "ingest", "vad", "asr", "llm", "tts")
+
+
+def speech_wav(seconds=1.5, rate=16000):
+    """
+    A spoken-length WAV upload: syllable-rate modulated voiced tone between
+    short silences, so VAD keeps it and ASR gets the whole utterance.
+    """
+    t = np.arange(int(seconds * rate)) / rate
+    voice = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    silence = np.zeros(int(0.3 * rate))
+    samples = np.concatenate([silence, voice * envelope * 6000, silence]).astype(np.int16)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def parse_server_timing(header):
+    timings = {}
+    for entry in filter(None, (part.strip() for part in header.split(","))):
+        name, _, duration = entry.partition(";dur=")
+        if duration:
+            timings[name] = float(duration)
+    return timings
+
+
+async def simulated_user(client, session_id, audio, think, deadline, turns):
+    """
+    One user taking voice turns back to back (plus think time) until the deadline.
+    """
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/process-audio",
+                files={"audio": ("turn.wav", audio, "audio/wav")},
+                data={"session_id": session_id, "expression": "Neutral 😊"}
+            )
+            ok = response.status_code == 200 and "error" not in response.json()
+            timings = parse_server_timing(response.headers.get("server-timing", ""))
+        except httpx.HTTPError:
+            ok, timings = False, {}
+        turns.append((time.perf_counter() - start, ok, timings))
+        if think:
+            await asyncio.sleep(think)
+
+
+async def run_step(url, users, duration, audio, think):
+    turns = []
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            simulated_user(client, f"load-{users}-{i}", audio, think, deadline, turns)
+            for i in range(users)
+        ])
+        elapsed = time.perf_counter() - start
+        # Conversations are per session; start the next step from empty histories
+        for i in range(users):
+            await client.post("/reset", data={"session_id": f"load-{users}-{i}"})
+    return turns, elapsed
+
+
+def summarize(users, turns, elapsed):
+    latencies = np.array([latency for latency, ok, _ in turns if ok]) * 1000
+    errors = sum(1 for _, ok, _ in turns if not ok)
+    stages = {}
+    for stage in STAGES + ("total",):
+        values = [timings[stage] for _, ok, timings in turns if ok and stage in timings]
+        stages[stage] = np.mean(values) if values else 0.0
+    # Time inside the server not spent in any timed stage: queueing for pool threads, the event loop, glue code
+    stages["wait"] = max(stages["total"] - sum(stages[stage] for stage in STAGES), 0.0)
+    return {
+        "users": users,
+        "throughput": len(latencies) / elapsed,
+        "p50": np.percentile(latencies, 50) if len(latencies) else 0.0,
+        "p95": np.percentile(latencies, 95) if len(latencies) else 0.0,
+        "errors": errors,
+        "stages": stages,
+    }
+
+
+def start_server(args, audio_dir):
+    env = dict(
+        os.environ,
+        ASR_ENGINE="stub",
+        TTS_ENGINE="stub",
+        LLM_ENGINE="stub",
+        STUB_ASR_LATENCY=args.asr_latency,
+        STUB_ASR_STREAMS=str(args.asr_streams),
+        STUB_LLM_LATENCY=args.llm_latency,
+        STUB_LLM_TOKEN_INTERVAL=str(args.llm_token_interval),
+        STUB_LLM_UNIQUE_REPLIES="0" if args.cacheable else "1",
+        STUB_TTS_LATENCY=args.tts_latency,
+        AUDIO_CACHE_DIR=audio_dir,
+        METRICS_ENABLED="1",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive concurrent simulated voice turns against /process-audio with local ASR/LLM/TTS stand-ins"
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=15, help="seconds per concurrency step")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds a user waits between turns")
+    parser.add_argument("--speech-seconds", type=float, default=1.5)
+    parser.add_argument("--url", help="target an already running server (its own engines) instead of starting one")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--asr-latency", default="lognormal:0.4,0.3", help="number or uniform:/normal:/lognormal: spec")
+    parser.add_argument("--asr-streams", type=int, default=64, help="concurrent recognitions the fake ASR serves")
+    parser.add_argument("--llm-latency", default="lognormal:0.5,0.4", help="time to first token")
+    parser.add_argument("--llm-token-interval", type=float, default=0.02)
+    parser.add_argument("--tts-latency", default="lognormal:0.25,0.3", help="per sentence")
+    parser.add_argument("--cacheable", action="store_true", help="repeat one reply so TTS is served from the audio cache")
+    args = parser.parse_args()
+
+    server = None
+    audio_dir = None
+    url = args.url
+    if url is None:
+        audio_dir = tempfile.TemporaryDirectory(prefix="voice-load-audio-")
+        server = start_server(args, audio_dir.name)
+        url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_for_server(url)
+        audio = speech_wav(args.speech_seconds)
+
+        header = f"{'users':>5} {'turns/s':>8} {'p50':>8} {'p95':>8} {'err':>4} " + " ".join(
+            f"{stage:>7}" for stage in STAGES + ("wait",)
+        )
+        print(header + "   (stage columns: mean ms per turn)")
+        rows = []
+        for users in args.users:
+            turns, elapsed = asyncio.run(run_step(url, users, args.duration, audio, args.think))
+            row = summarize(users, turns, elapsed)
+            rows.append(row)
+            print(
+                f"{users:>5} {row['throughput']:8.2f} {row['p50']:6.0f}ms {row['p95']:6.0f}ms {row['errors']:>4} "
+                + " ".join(f"{row['stages'][stage]:7.0f}" for stage in STAGES + ("wait",))
+            )
+
+        # Saturation: the first step where more users stopped buying at least 10% more throughput
+        for previous, row in zip(rows, rows[1:]):
+            if row["throughput"] < previous["throughput"] * 1.1:
+                slowest = max(STAGES + ("wait",), key=lambda stage: row["stages"][stage] - previous["stages"][stage])
+                print(
+                    f"saturates at ~{previous['users']} users ({previous['throughput']:.2f} turns/s);"
+                    f" beyond that '{slowest}' grows the most"
+                )
+                break
+        else:
+            print("no saturation within the tested concurrency")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if audio_dir is not None:
+            audio_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
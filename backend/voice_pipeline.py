@@ -0,0 +1,231 @@
+import io
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import speech_recognition as sr
+from asr import transcribe_utterances
+from graph import stream_response, summarize_history
+from tts import SentenceChunker
+from vad import vad
+
+UNRECOGNIZED_MESSAGE = "क्षमा करें, मैं आपकी बात समझ नहीं पाया। कृपया फिर से प्रयास करें।"
+
+
+class AudioPlayer:
+    """
+    Plays MP3 bytes from memory on a mixer that stays initialized for the
+    whole session, so replies cost neither mixer start-up nor a file write.
+    """
+
+    def __init__(self):
+        pygame.mixer.init()
+
+    def play(self, audio_bytes, keep_playing):
+        """
+        Play until the clip ends or keep_playing() turns false.
+        Returns False if playback was cut short.
+        """
+        pygame.mixer.music.load(io.BytesIO(audio_bytes), "mp3")
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy():
+            if not keep_playing():
+                pygame.mixer.music.stop()
+                return False
+            time.sleep(0.02)
+        return True
+
+    def close(self):
+        pygame.mixer.quit()
+
+
+class VoicePipeline:
+    """
+    The CLI assistant as overlapping stages connected by queues:
+    capture -> recognition -> generation -> synthesis -> playback.
+    The microphone is read continuously, so the next utterance is captured
+    and recognized while the current reply is still being generated or
+    spoken. Replies are synthesized sentence by sentence as the LLM streams
+    and played in order from memory.
+
+    Barge-in: when speech starts while the assistant is talking, the reply
+    is abandoned. Every reply belongs to a turn number; starting to speak
+    advances it, and stages drop whatever belongs to an older turn. While
+    the assistant talks, speech must be barge_in_factor times louder than
+    the ambient threshold, so the speaker's own output does not interrupt it.
+    """
+
+    def __init__(self, recognizer, source, asr_engine, tts_engine, expression_context,
+                 barge_in_factor=None, tts_workers=4):
+        self.recognizer = recognizer
+        self.source = source
+        self.asr_engine = asr_engine
+        self.tts_engine = tts_engine
+        self.expression_context = expression_context
+        self.barge_in_factor = barge_in_factor or float(os.getenv("BARGE_IN_FACTOR", 3))
+
+        self.messages = []
+        self.summary = ""
+
+        self._captures = queue.Queue()
+        self._transcripts = queue.Queue()
+        self._playback = queue.Queue()
+        self._tts_pool = ThreadPoolExecutor(max_workers=tts_workers, thread_name_prefix="tts")
+        self._summary_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
+        self._folding = None
+        self._turn = 0
+        self._turn_lock = threading.Lock()
+        self._speaking = threading.Event()
+        self._base_threshold = recognizer.energy_threshold
+
+    def run(self):
+        player = AudioPlayer()
+        # The listener moves the threshold itself; barge-in needs it stable
+        self.recognizer.dynamic_energy_threshold = False
+        self._base_threshold = self.recognizer.energy_threshold
+
+        for target in (self._recognize_loop, self._generate_loop):
+            threading.Thread(target=target, daemon=True).start()
+        threading.Thread(target=self._capture_loop, daemon=True).start()
+        try:
+            self._playback_loop(player)
+        finally:
+            self._tts_pool.shutdown(wait=False, cancel_futures=True)
+            self._summary_pool.shutdown(wait=False, cancel_futures=True)
+            player.close()
+
+    def current_turn(self):
+        with self._turn_lock:
+            return self._turn
+
+    def barge_in(self):
+        with self._turn_lock:
+            self._turn += 1
+        print("\n⏹️  (बीच में रोका गया)")
+
+    def _capture_loop(self):
+        print("कृपया बोलें...")  # "Please speak..." in Hindi
+        while True:
+            chunks = []
+            for chunk in self.recognizer.listen(self.source, stream=True):
+                if not chunks and self._speaking.is_set():
+                    self.barge_in()
+                chunks.append(chunk.frame_data)
+            if chunks:
+                self._captures.put(sr.AudioData(b"".join(chunks), self.source.SAMPLE_RATE, self.source.SAMPLE_WIDTH))
+
+    def _recognize_loop(self):
+        while True:
+            audio = self._captures.get()
+            utterances = vad.split(audio)
+            if not utterances:
+                continue
+            try:
+                text = transcribe_utterances(self.asr_engine, utterances)
+            except sr.UnknownValueError:
+                print(UNRECOGNIZED_MESSAGE)
+                continue
+            except sr.RequestError as e:
+                print(f"सेवा में समस्या है; {e}")
+                continue
+            self._transcripts.put(text)
+
+    def _generate_loop(self):
+        while True:
+            text = self._transcripts.get()
+            self._respond(text, self.current_turn())
+
+    def _respond(self, text, turn):
+        print("आपने कहा:", text)
+        self._apply_summary()
+        self.messages.append({"role": "user", "content": text + self.expression_context()})
+
+        chunker = SentenceChunker()
+        spoken = []
+        final = None
+        for kind, value in stream_response(self.messages, self.summary):
+            if self.current_turn() != turn:
+                break
+            if kind == "token":
+                print(value, end="", flush=True)
+                for sentence in chunker.feed(value):
+                    spoken.append(sentence)
+                    self._speak(sentence, turn)
+            else:
+                final = value
+        print()
+
+        if final is None:
+            # Interrupted: keep what was generated so the history stays alternating
+            if spoken:
+                self.messages.append({"role": "assistant", "content": " ".join(spoken)})
+            else:
+                self.messages.pop()
+            return
+
+        rest = chunker.flush()
+        if rest:
+            self._speak(rest, turn)
+        if final:
+            self.messages.append({"role": "assistant", "content": final})
+            self._summarize()
+
+    def _summarize(self):
+        """
+        Start folding older turns into the running summary while the reply plays.
+        """
+        if self._folding is None:
+            self._folding = self._summary_pool.submit(summarize_history, list(self.messages), self.summary)
+
+    def _apply_summary(self):
+        """
+        Take in a finished summarization. Only messages newer than the
+        snapshot it was written from are added or removed meanwhile, so its
+        folded count still marks the oldest messages it covers.
+        """
+        if self._folding is None or not self._folding.done():
+            return
+        future, self._folding = self._folding, None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Summary error: {e}")
+            return
+        if result is not None:
+            self.summary, folded = result
+            del self.messages[:folded]
+
+    def _speak(self, sentence, turn):
+        self._playback.put((turn, self._tts_pool.submit(self.tts_engine.synthesize, sentence)))
+
+    def _playback_loop(self, player):
+        while True:
+            try:
+                turn, future = self._playback.get(timeout=0.1)
+            except queue.Empty:
+                self._set_speaking(False)
+                continue
+            if turn != self.current_turn():
+                future.cancel()
+                continue
+            try:
+                audio_bytes = future.result()
+            except Exception as e:
+                print(f"TTS error: {e}")
+                continue
+            if turn != self.current_turn():
+                continue
+            self._set_speaking(True)
+            player.play(audio_bytes, lambda: turn == self.current_turn())
+
+    def _set_speaking(self, speaking):
+        if speaking == self._speaking.is_set():
+            return
+        if speaking:
+            self._speaking.set()
+            self.recognizer.energy_threshold = self._base_threshold * self.barge_in_factor
+        else:
+            self._speaking.clear()
+            self.recognizer.energy_threshold = self._base_threshold
@@ -29,6 +29,14 @@ export default function Home() {
   const analyserRef = useRef<AnalyserNode | null>(null)
   const webcamRef = useRef<Webcam>(null)
   const currentAudioRef = useRef<HTMLAudioElement | null>(null)
+  const audioQueueRef = useRef<string[]>([])
+  const playlistRef = useRef<string[]>([])
+  const sessionIdRef = useRef<string>("")
+
+  // One conversation per tab; the backend keys history on this id
+  if (!sessionIdRef.current && typeof window !== "undefined") {
+    sessionIdRef.current = crypto.randomUUID()
+  }
 
   useEffect(() => {
     const initAudioContext = () => {
@@ -112,32 +120,71 @@ export default function Home() {
     }
   }
 
+  const handleStreamEvent = (event: string, data: any) => {
+    if (event === "transcript") {
+      stopAudio()
+      playlistRef.current = []
+      setTranscript(data.transcript || "")
+      setResponse("")
+    } else if (event === "token") {
+      setResponse((previous) => previous + data.text)
+    } else if (event === "response") {
+      setResponse(data.response || "")
+    } else if (event === "audio") {
+      // Sentence chunks arrive in order; play them back to back
+      const fullAudioUrl = `${BACKEND_URL}${data.audio_url}`
+      playlistRef.current.push(fullAudioUrl)
+      setCurrentAudioUrl(playlistRef.current[0])
+      enqueueAudio(fullAudioUrl)
+    } else if (event === "error") {
+      throw new Error(data.detail || "Stream error")
+    }
+  }
+
   const sendAudioToBackend = async (audioBlob: Blob) => {
     try {
       const formData = new FormData()
       formData.append("audio", audioBlob, "recording.webm")
       formData.append("expression", expression)
       formData.append("expression_confidence", confidence.toString())
+      formData.append("session_id", sessionIdRef.current)
 
-      const res = await fetch(`${BACKEND_URL}/process-audio`, {
+      // Server-Sent Events: transcript, response tokens and audio arrive as they are ready
+      const res = await fetch(`${BACKEND_URL}/process-audio/stream`, {
         method: "POST",
         body: formData,
       })
 
-      if (!res.ok) {
-        const errorText = await res.text()
+      if (!res.ok || !res.body) {
         throw new Error(`Failed to process audio: ${res.status}`)
       }
 
-      const data = await res.json()
-      setTranscript(data.transcript || "")
-      setResponse(data.response || "")
-      setIsSpeaking(true)
+      const reader = res.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ""
+
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) {
+          break
+        }
 
-      if (data.audio_url) {
-        const fullAudioUrl = `${BACKEND_URL}${data.audio_url}`
-        setCurrentAudioUrl(fullAudioUrl)
-        playAudio(fullAudioUrl)
+        buffer += decoder.decode(value, { stream: true })
+        const events = buffer.split("\n\n")
+        buffer = events.pop() || ""
+
+        for (const rawEvent of events) {
+          let event = "message"
+          let data = ""
+          for (const line of rawEvent.split("\n")) {
+            if (line.startsWith("event: ")) {
+              event = line.slice(7)
+            } else if (line.startsWith("data: ")) {
+              data += line.slice(6)
+            }
+          }
+          handleStreamEvent(event, data ? JSON.parse(data) : {})
+        }
       }
     } catch (error) {
       setResponse("Error processing your request. Please try again.")
@@ -146,27 +193,40 @@ export default function Home() {
     }
   }
 
-  const playAudio = (audioUrl: string) => {
+  const stopAudio = () => {
+    audioQueueRef.current = []
     if (currentAudioRef.current) {
       currentAudioRef.current.pause()
       currentAudioRef.current.currentTime = 0
+      currentAudioRef.current = null
     }
+  }
 
-    const audio = new Audio(audioUrl)
-    currentAudioRef.current = audio
-    audio.onended = () => {
+  const playNext = () => {
+    const nextUrl = audioQueueRef.current.shift()
+    if (!nextUrl) {
       setIsSpeaking(false)
       currentAudioRef.current = null
+      return
     }
+
+    const audio = new Audio(nextUrl)
+    currentAudioRef.current = audio
+    audio.onended = playNext
     audio.play()
   }
 
-  const reset = async () => {
-    if (currentAudioRef.current) {
-      currentAudioRef.current.pause()
-      currentAudioRef.current.currentTime = 0
-      currentAudioRef.current = null
+  const enqueueAudio = (audioUrl: string) => {
+    audioQueueRef.current.push(audioUrl)
+    if (!currentAudioRef.current) {
+      setIsSpeaking(true)
+      playNext()
     }
+  }
+
+  const reset = async () => {
+    stopAudio()
+    playlistRef.current = []
 
     setTranscript("")
     setResponse("")
@@ -176,8 +236,12 @@ export default function Home() {
     setCurrentAudioUrl(null)
 
     try {
+      const formData = new FormData()
+      formData.append("session_id", sessionIdRef.current)
+
       await fetch(`${BACKEND_URL}/reset`, {
         method: "POST",
+        body: formData,
       })
     } catch (error) {
       // Error resetting conversation
@@ -185,9 +249,9 @@ export default function Home() {
   }
 
   const replayAudio = () => {
-    if (currentAudioUrl) {
-      setIsSpeaking(true)
-      playAudio(currentAudioUrl)
+    if (playlistRef.current.length > 0) {
+      stopAudio()
+      playlistRef.current.forEach(enqueueAudio)
     }
   }
 
@@ -234,6 +298,7 @@ export default function Home() {
               </div>
               <ExpressionDetector
                 webcamRef={webcamRef}
+                sessionId={sessionIdRef.current}
                 onExpressionChange={(expr, conf) => {
                   setExpression(expr)
                   setConfidence(conf)
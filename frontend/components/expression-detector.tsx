@@ -2,24 +2,94 @@
 
 import type React from "react"
 
-import { useEffect, useState, useCallback } from "react"
+import { useEffect, useState, useCallback, useRef } from "react"
 import Webcam from "react-webcam"
 
 interface ExpressionDetectorProps {
   webcamRef: React.RefObject<Webcam>
   onExpressionChange: (expression: string, confidence: number) => void
   onFaceDetected?: (detected: boolean) => void
+  sessionId: string
 }
 
 const BACKEND_URL = typeof window !== 'undefined' 
   ? (process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8000")
   : "http://localhost:8000"
 
-export default function ExpressionDetector({ webcamRef, onExpressionChange, onFaceDetected }: ExpressionDetectorProps) {
+const WS_URL = BACKEND_URL.replace(/^http/, "ws") + "/ws/expression"
+
+export default function ExpressionDetector({ webcamRef, onExpressionChange, onFaceDetected, sessionId }: ExpressionDetectorProps) {
   const [isDetecting, setIsDetecting] = useState(false)
   const [faceDetected, setFaceDetected] = useState(false)
   const [error, setError] = useState<string>("")
 
+  const socketRef = useRef<WebSocket | null>(null)
+
+  // The parent passes new callback functions on every render; reading them
+  // through a ref keeps the socket from being reopened each time
+  const callbacksRef = useRef({ onExpressionChange, onFaceDetected })
+  callbacksRef.current = { onExpressionChange, onFaceDetected }
+
+  const handleResult = useCallback((data: any) => {
+    const { onExpressionChange, onFaceDetected } = callbacksRef.current
+    if (data.face_detected) {
+      setFaceDetected(true)
+      onFaceDetected?.(true)
+      onExpressionChange(data.expression, data.confidence)
+    } else {
+      setFaceDetected(false)
+      onFaceDetected?.(false)
+      onExpressionChange("Neutral", 0)
+    }
+
+    setError("")
+  }, [])
+
+  const handleError = useCallback(() => {
+    setError("Detection error")
+    setFaceDetected(false)
+    callbacksRef.current.onFaceDetected?.(false)
+  }, [])
+
+  // Results stream back over the socket; the server keeps only the newest
+  // pending frame, so a slow backend never returns stale expressions.
+  useEffect(() => {
+    let closed = false
+    let retryTimer: ReturnType<typeof setTimeout> | undefined
+
+    const connect = () => {
+      // The server smooths expressions per session across frames
+      const socket = new WebSocket(`${WS_URL}?session_id=${encodeURIComponent(sessionId)}`)
+      socket.binaryType = "arraybuffer"
+
+      socket.onmessage = (event) => {
+        try {
+          handleResult(JSON.parse(event.data))
+        } catch {
+          handleError()
+        }
+      }
+
+      socket.onclose = () => {
+        socketRef.current = null
+        if (!closed) {
+          retryTimer = setTimeout(connect, 2000)
+        }
+      }
+
+      socketRef.current = socket
+    }
+
+    connect()
+
+    return () => {
+      closed = true
+      clearTimeout(retryTimer)
+      socketRef.current?.close()
+      socketRef.current = null
+    }
+  }, [handleResult, handleError, sessionId])
+
   const detectFace = useCallback(async () => {
     if (!webcamRef.current) {
       return
@@ -49,8 +119,19 @@ export default function ExpressionDetector({ webcamRef, onExpressionChange, onFa
       const response = await fetch(imageSrc)
       const blob = await response.blob()
 
+      const socket = socketRef.current
+      if (socket && socket.readyState === WebSocket.OPEN) {
+        // Skip this frame if the previous one has not left the browser yet
+        if (socket.bufferedAmount === 0) {
+          socket.send(blob)
+        }
+        return
+      }
+
+      // Fall back to plain HTTP while the socket is (re)connecting
       const formData = new FormData()
       formData.append("image", blob, "frame.jpg")
+      formData.append("session_id", sessionId)
 
       const backendResponse = await fetch(`${BACKEND_URL}/detect-face`, {
         method: "POST",
@@ -61,27 +142,13 @@ export default function ExpressionDetector({ webcamRef, onExpressionChange, onFa
         throw new Error(`Backend error: ${backendResponse.status}`)
       }
 
-      const data = await backendResponse.json()
-
-      if (data.face_detected) {
-        setFaceDetected(true)
-        onFaceDetected?.(true)
-        onExpressionChange(data.expression, data.confidence)
-      } else {
-        setFaceDetected(false)
-        onFaceDetected?.(false)
-        onExpressionChange("Neutral", 0)
-      }
-
-      setError("")
+      handleResult(await backendResponse.json())
     } catch (error) {
-      setError("Detection error")
-      setFaceDetected(false)
-      onFaceDetected?.(false)
+      handleError()
     } finally {
       setIsDetecting(false)
     }
-  }, [webcamRef, onExpressionChange, onFaceDetected, isDetecting])
+  }, [webcamRef, isDetecting, handleResult, handleError, sessionId])
 
   useEffect(() => {
     const interval = setInterval(() => {